@@ -1,29 +1,402 @@
 """HCDP API client for making requests to the Hawaii Climate Data Portal."""
 
+import asyncio
 import os
-import json
-from typing import Dict, List, Optional, Any
+import re
+import time
+from collections import OrderedDict
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional,
+    Tuple, TypedDict, cast
+)
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
 
-load_dotenv()
+from . import serialization
+
+_MISSING = object()
+STREAM_CHUNK_SIZE = 64 * 1024
+# Query-string spellings of booleans, indexed by bool
+_BOOL_STR = ("false", "true")
+# ISO-8601 dates as accepted by the API: YYYY, YYYY-MM or YYYY-MM-DD, optional time
+_DATE_RE = re.compile(r"^\d{4}(?:-\d{2}){0,2}(?:T\S+)?$")
+_COORD_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+class _ResponseCache:
+    """Bounded LRU cache of parsed responses with a per-entry time-to-live.
+    
+    Binary payloads ({"data": bytes}, e.g. GeoTIFF rasters) also count
+    against ``maxbytes`` so a run of large downloads can't pin hundreds of
+    megabytes; a payload larger than the whole budget is not cached.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._nbytes = 0
+    
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._pop(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        size = _binary_size(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value, size)
+        self._nbytes += size
+        while len(self._entries) > self.maxsize or (
+            self.maxbytes is not None and self._nbytes > self.maxbytes
+        ):
+            self._pop(next(iter(self._entries)))
+    
+    def _pop(self, key: Hashable) -> None:
+        self._nbytes -= self._entries.pop(key)[2]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self._nbytes = 0
+
+
+def _binary_size(value: Any) -> int:
+    """Size in bytes of a wrapped binary response, 0 for parsed JSON."""
+    if isinstance(value, dict):
+        data = value.get("data")
+        if isinstance(data, bytes):
+            return len(data)
+    return 0
+
+
+_dotenv_loaded = False
+
+
+class RasterParams(TypedDict, total=False):
+    """Query parameters for /raster requests."""
+    datatype: str
+    date: str
+    extent: str
+    location: str
+    production: str
+    aggregation: str
+    timescale: str
+    period: str
+
+
+class TimeseriesParams(TypedDict, total=False):
+    """Query parameters for /raster/timeseries requests."""
+    datatype: str
+    start: str
+    end: str
+    extent: str
+    location: str
+    lat: float
+    lng: float
+    production: str
+    aggregation: str
+    timescale: str
+    period: str
+
+
+class MesonetParams(TypedDict, total=False):
+    """Query parameters for /mesonet/db/measurements requests."""
+    location: str
+    join_metadata: str
+    station_ids: str
+    start_date: str
+    end_date: str
+    var_ids: str
+    intervals: str
+    limit: int
+    offset: int
+
+
+def configure(dotenv_path: Optional[str] = None, override: bool = False) -> None:
+    """Load HCDP settings (HCDP_API_TOKEN, HCDP_BASE_URL) from a .env file.
+    
+    Called automatically the first time an HCDPClient needs a setting from
+    the environment; applications may call it earlier to pick the file.
+    """
+    global _dotenv_loaded
+    load_dotenv(dotenv_path, override=override)
+    _dotenv_loaded = True
+
+
+def _freeze_params(params: Mapping[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Turn a query-param dict into a hashable, order-independent key."""
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()
+    ))
+
+
+def _validate_date(name: str, value: str) -> None:
+    """Reject malformed dates locally instead of paying for a 400 from the API."""
+    if not isinstance(value, str) or not _DATE_RE.match(value):
+        raise ValueError(
+            f"Invalid {name} {value!r}: expected an ISO-8601 date such as '2024-01' or '2024-01-15'"
+        )
+
+
+def _coord(name: str, value: Any) -> Optional[float]:
+    """Validate a coordinate and return it as a float.
+
+    Normalizing means "21.30", "21.3" and 21.3 share one cache entry.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) or (isinstance(value, str) and _COORD_RE.match(value)):
+        return float(value)
+    raise ValueError(f"Invalid {name} {value!r}: expected a decimal number")
+
+
+def _drop_none(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unset optional parameters so they are omitted from the request."""
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def _shallow_copy(value: Any) -> Any:
+    """Copy a cached container so callers can't mutate the cached entry."""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
 
 
 class HCDPClient:
     """Client for interacting with the HCDP API."""
     
+    # Historical climate products are static, so cached GETs can live for hours
+    CACHE_MAXSIZE = 512
+    CACHE_TTL = 6 * 60 * 60
+    # Upper bound on cached binary payloads (rasters, production files)
+    CACHE_MAXBYTES = 256 * 1024 * 1024
+    # Station rosters and variable lists change occasionally, so refresh hourly
+    ROSTER_CACHE_TTL = 60 * 60
+    # Reconnect attempts (with httpcore's exponential backoff) on connect errors
+    CONNECT_RETRIES = 3
+    # Tool calls often arrive more than httpx's default 5s apart; hold idle
+    # connections longer, but under the common 60s load-balancer idle timeout
+    KEEPALIVE_EXPIRY = 50.0
+    
+    # Separate connect budget so a stalled handshake or pool wait fails fast
+    # instead of hiding inside the long read timeout
+    _TIMEOUT_DEFAULT = httpx.Timeout(60.0, connect=10.0)
+    _TIMEOUT_ZIP = httpx.Timeout(120.0, connect=10.0)
+    
     def __init__(self, api_token: Optional[str] = None, base_url: Optional[str] = None):
+        if not _dotenv_loaded and (api_token is None or base_url is None):
+            configure()
         self.api_token = api_token or os.getenv("HCDP_API_TOKEN")
-        self.base_url = base_url or os.getenv("HCDP_BASE_URL", "https://api.hcdp.ikewai.org")
+        self.base_url: str = base_url or os.getenv("HCDP_BASE_URL") or "https://api.hcdp.ikewai.org"
         
         if not self.api_token:
             raise ValueError("HCDP API token is required. Set HCDP_API_TOKEN environment variable.")
             
-        self.headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
+        # Endpoint URLs are fixed per client, so build them once
+        self._url_raster = f"{self.base_url}/raster"
+        self._url_timeseries = f"{self.base_url}/raster/timeseries"
+        self._url_stations = f"{self.base_url}/stations"
+        self._url_mesonet = f"{self.base_url}/mesonet/db/measurements"
+        self._url_genzip_email = f"{self.base_url}/genzip/email"
+        self._url_genzip_link = f"{self.base_url}/genzip/instant/link"
+        self._url_genzip_content = f"{self.base_url}/genzip/instant/content"
+        self._url_genzip_splitlink = f"{self.base_url}/genzip/instant/splitlink"
+        self._url_production_list = f"{self.base_url}/files/production/list"
+        self._url_production_retrieve = f"{self.base_url}/files/production/retrieve"
+        self._url_mesonet_stations = f"{self.base_url}/mesonet/db/stations"
+        self._url_mesonet_variables = f"{self.base_url}/mesonet/db/variables"
+        self._url_mesonet_station_monitor = f"{self.base_url}/mesonet/db/stationMonitor"
+        self._url_mesonet_email = f"{self.base_url}/mesonet/db/measurements/email"
+        
+        # Encoded to bytes once here; the pooled client sends these on every request
+        self._auth_bytes = f"Bearer {self.api_token}".encode("ascii")
+        self.headers = httpx.Headers([
+            (b"Authorization", self._auth_bytes),
+            (b"Content-Type", b"application/json"),
+            # JSON climate payloads compress 5-10x; httpx decodes br via brotli
+            (b"Accept-Encoding", b"gzip, br")
+        ])
+        
+        # One pooled client per HCDPClient so keep-alive connections are reused;
+        # HTTP/2 lets concurrent requests multiplex over a single connection.
+        # Transport retries only cover failed connection attempts, so no request
+        # is ever sent twice and POSTs are as safe to retry as GETs.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=self.CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY
+            )
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=self._TIMEOUT_DEFAULT,
+            transport=transport
+        )
+        self._cache = _ResponseCache(self.CACHE_MAXSIZE, self.CACHE_TTL, self.CACHE_MAXBYTES)
+        self._roster_cache = _ResponseCache(16, self.ROSTER_CACHE_TTL)
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "HCDPClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    def clear_cache(self) -> None:
+        """Drop all cached GET responses."""
+        self._cache.clear()
+        self._roster_cache.clear()
+    
+    @staticmethod
+    def _check(response: httpx.Response) -> None:
+        """Raise for error statuses; successes cost one integer compare."""
+        if response.status_code >= 400:
+            response.raise_for_status()
+    
+    async def _single_flight(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Share one in-flight request between concurrent identical calls."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    async def _get(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        *,
+        timeout: Optional[httpx.Timeout] = None,
+        allow_binary: bool = False,
+        raw: bool = False
+    ) -> Any:
+        """GET an endpoint and parse the body."""
+        response = await self._client.get(
+            url, params=params, timeout=timeout or self._TIMEOUT_DEFAULT
+        )
+        self._check(response)
+        return self._parse(response, allow_binary, raw)
+    
+    async def _post(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        timeout: Optional[httpx.Timeout] = None,
+        raw: bool = False
+    ) -> Any:
+        """POST a JSON payload and parse the body."""
+        response = await self._client.post(
+            url, json=payload, timeout=timeout or self._TIMEOUT_ZIP
+        )
+        self._check(response)
+        return self._parse(response, False, raw)
+    
+    @staticmethod
+    def _parse(response: httpx.Response, allow_binary: bool, raw: bool) -> Any:
+        """Decode a checked response as JSON, or wrap raw bytes."""
+        if raw:
+            return {"data": response.content}
+        if allow_binary:
+            # Binary payloads (GeoTIFF) fail on the first byte, so trying the
+            # parser is cheaper than inspecting the content-type header
+            try:
+                return serialization.loads(response.content)
+            except (serialization.JSONDecodeError, UnicodeDecodeError):
+                return {"data": response.content}
+        return serialization.loads(response.content)
+    
+    async def _cached_get(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        allow_binary: bool = False,
+        cache: Optional[_ResponseCache] = None
+    ) -> Any:
+        """GET an idempotent endpoint, serving repeat queries from the cache."""
+        cache = cache or self._cache
+        key = (url, _freeze_params(params))
+        result = cache.get(key)
+        if result is _MISSING:
+            result = await self._single_flight(
+                key, lambda: self._fetch_into_cache(cache, key, url, params, allow_binary)
+            )
+        return _shallow_copy(result)
+    
+    async def _fetch_into_cache(
+        self,
+        cache: _ResponseCache,
+        key: Hashable,
+        url: str,
+        params: Mapping[str, Any],
+        allow_binary: bool
+    ) -> Any:
+        result = await self._get(url, params, allow_binary=allow_binary)
+        cache.set(key, result)
+        return result
+    
+    @staticmethod
+    def _raster_params(
+        datatype: str,
+        date: str,
+        extent: str,
+        location: Optional[str] = None,
+        production: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        timescale: Optional[str] = None,
+        period: Optional[str] = None
+    ) -> RasterParams:
+        _validate_date("date", date)
+        return cast(RasterParams, _drop_none({
+            "datatype": datatype,
+            "date": date,
+            "extent": extent,
+            "location": location,
+            "production": production,
+            "aggregation": aggregation,
+            "timescale": timescale,
+            "period": period
+        }))
+    
+    async def _stream_get(
+        self,
+        url: str,
+        params: Mapping[str, Any],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        timeout: Optional[httpx.Timeout] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a response body in chunks without buffering it in memory."""
+        async with self._client.stream(
+            "GET", url, params=params, timeout=timeout or self._TIMEOUT_DEFAULT
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
     
     async def get_raster_data(
         self,
@@ -37,31 +410,60 @@ class HCDPClient:
         period: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get climate raster data."""
-        params = {
-            "datatype": datatype,
-            "date": date,
-            "extent": extent
-        }
-        if location:
-            params["location"] = location
-        if production:
-            params["production"] = production
-        if aggregation:
-            params["aggregation"] = aggregation
-        if timescale:
-            params["timescale"] = timescale
-        if period:
-            params["period"] = period
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/raster",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.content}
+        params = self._raster_params(
+            datatype, date, extent, location, production, aggregation, timescale, period
+        )
+        return await self._cached_get(self._url_raster, params, allow_binary=True)
+    
+    async def get_raster_data_bulk(
+        self,
+        dates: List[str],
+        datatype: str,
+        extent: str,
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        **kwargs: Any
+    ) -> List[Any]:
+        """Get climate raster data for several dates concurrently.
+        
+        Results are returned in the same order as ``dates``. At most
+        ``concurrency`` requests are in flight at once; remaining keyword
+        arguments are passed through to get_raster_data.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(date: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_raster_data(
+                    datatype=datatype, date=date, extent=extent, **kwargs
+                )
+        
+        return await asyncio.gather(
+            *(fetch_one(date) for date in dates), return_exceptions=return_exceptions
+        )
+    
+    async def iter_raster_data(
+        self,
+        datatype: str,
+        date: str,
+        extent: str,
+        location: Optional[str] = None,
+        production: Optional[str] = None,
+        aggregation: Optional[str] = None,
+        timescale: Optional[str] = None,
+        period: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream climate raster data (e.g. a GeoTIFF) in chunks.
+        
+        Use this instead of get_raster_data when writing large rasters to disk,
+        so peak memory stays at the chunk size rather than the full file.
+        """
+        params = self._raster_params(
+            datatype, date, extent, location, production, aggregation, timescale, period
+        )
+        async for chunk in self._stream_get(self._url_raster, params, chunk_size):
+            yield chunk
     
     async def get_timeseries_data(
         self,
@@ -78,34 +480,26 @@ class HCDPClient:
         period: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get time series data for a specific location."""
-        params = {
+        _validate_date("start", start)
+        _validate_date("end", end)
+        lat = _coord("lat", lat)
+        lng = _coord("lng", lng)
+        has_point = lat is not None and lng is not None
+        params = cast(TimeseriesParams, _drop_none({
             "datatype": datatype,
             "start": start,
             "end": end,
             "extent": extent,
-            "location": location
-        }
-        if lat is not None and lng is not None:
-            params["lat"] = lat
-            params["lng"] = lng
-        if production:
-            params["production"] = production
-        if aggregation:
-            params["aggregation"] = aggregation
-        if timescale:
-            params["timescale"] = timescale
-        if period:
-            params["period"] = period
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/raster/timeseries",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+            "location": location,
+            "lat": lat if has_point else None,
+            "lng": lng if has_point else None,
+            "production": production,
+            "aggregation": aggregation,
+            "timescale": timescale,
+            "period": period
+        }))
+        
+        return await self._cached_get(self._url_timeseries, params)
     
     async def get_station_data(
         self,
@@ -114,23 +508,9 @@ class HCDPClient:
         offset: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get station data using query parameter."""
-        params = {
-            "q": q
-        }
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/stations",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        params = _drop_none({"q": q, "limit": limit, "offset": offset})
+        
+        return await self._cached_get(self._url_stations, params)
     
     async def get_mesonet_data(
         self,
@@ -145,34 +525,42 @@ class HCDPClient:
         join_metadata: bool = True
     ) -> Dict[str, Any]:
         """Get mesonet weather station measurements."""
-        params = {
+        params = cast(MesonetParams, _drop_none({
             "location": location,
-            "join_metadata": str(join_metadata).lower()
-        }
-        if station_ids:
-            params["station_ids"] = station_ids
-        if start_date:
-            params["start_date"] = start_date
-        if end_date:
-            params["end_date"] = end_date
-        if var_ids:
-            params["var_ids"] = var_ids
-        if intervals:
-            params["intervals"] = intervals
-        if limit:
-            params["limit"] = limit
-        if offset:
-            params["offset"] = offset
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/measurements",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+            "join_metadata": _BOOL_STR[bool(join_metadata)],
+            "station_ids": station_ids,
+            "start_date": start_date,
+            "end_date": end_date,
+            "var_ids": var_ids,
+            "intervals": intervals,
+            "limit": limit,
+            "offset": offset
+        }))
+        
+        url = self._url_mesonet
+        result = await self._single_flight(
+            (url, _freeze_params(params)), lambda: self._get(url, params)
+        )
+        return _shallow_copy(result)
+    
+    @staticmethod
+    def _package_files(
+        datatype: str,
+        production: Optional[str],
+        period: Optional[str],
+        extent: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Build the basic single-entry file list for a genzip request."""
+        return [_drop_none({
+            "datatype": datatype,
+            "production": production,
+            "period": period,
+            "extent": extent,
+            "start_date": start_date,
+            "end_date": end_date
+        })]
     
     async def generate_data_package_email(
         self,
@@ -187,38 +575,21 @@ class HCDPClient:
         zipName: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate a downloadable data package and email it."""
-        data_config = {
-            "datatype": datatype
-        }
-        if production:
-            data_config["production"] = production
-        if period:
-            data_config["period"] = period
-        if extent:
-            data_config["extent"] = extent
-        if start_date:
-            data_config["start_date"] = start_date
-        if end_date:
-            data_config["end_date"] = end_date
-        if files:
-            data_config["files"] = files
-            
-        payload = {
+        data_config = _drop_none({
+            "datatype": datatype,
+            "production": production,
+            "period": period,
+            "extent": extent,
+            "start_date": start_date,
+            "end_date": end_date,
+            "files": files
+        })
+        payload = _drop_none({
             "email": email,
-            "data": json.dumps(data_config)
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/email",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+            "data": serialization.dumps(data_config),
+            "zipName": zipName
+        })
+        return await self._post(self._url_genzip_email, payload)
     
     async def generate_data_package_instant_link(
         self,
@@ -234,34 +605,9 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Generate instant download link for data package."""
         if files is None:
-            # Create basic file data structure
-            files = [{
-                "datatype": datatype,
-                "production": production,
-                "period": period,
-                "extent": extent,
-                "start_date": start_date,
-                "end_date": end_date
-            }]
-            # Remove None values
-            files = [{k: v for k, v in file_data.items() if v is not None} for file_data in files]
-            
-        payload = {
-            "email": email,
-            "data": files
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/link",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+            files = self._package_files(datatype, production, period, extent, start_date, end_date)
+        payload = _drop_none({"email": email, "data": files, "zipName": zipName})
+        return await self._post(self._url_genzip_link, payload)
     
     async def generate_data_package_instant_content(
         self,
@@ -277,32 +623,9 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Generate instant download content for data package."""
         if files is None:
-            files = [{
-                "datatype": datatype,
-                "production": production,
-                "period": period,
-                "extent": extent,
-                "start_date": start_date,
-                "end_date": end_date
-            }]
-            files = [{k: v for k, v in file_data.items() if v is not None} for file_data in files]
-            
-        payload = {
-            "email": email,
-            "data": files
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/content",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return {"data": response.content}
+            files = self._package_files(datatype, production, period, extent, start_date, end_date)
+        payload = _drop_none({"email": email, "data": files, "zipName": zipName})
+        return await self._post(self._url_genzip_content, payload, raw=True)
     
     async def generate_data_package_splitlink(
         self,
@@ -318,32 +641,9 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Generate split download links for data package."""
         if files is None:
-            files = [{
-                "datatype": datatype,
-                "production": production,
-                "period": period,
-                "extent": extent,
-                "start_date": start_date,
-                "end_date": end_date
-            }]
-            files = [{k: v for k, v in file_data.items() if v is not None} for file_data in files]
-            
-        payload = {
-            "email": email,
-            "data": files
-        }
-        if zipName:
-            payload["zipName"] = zipName
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/genzip/instant/splitlink",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
+            files = self._package_files(datatype, production, period, extent, start_date, end_date)
+        payload = _drop_none({"email": email, "data": files, "zipName": zipName})
+        return await self._post(self._url_genzip_splitlink, payload)
     
     async def list_production_files(
         self,
@@ -353,39 +653,33 @@ class HCDPClient:
         extent: Optional[str] = None
     ) -> Dict[str, Any]:
         """List available production files."""
-        data_config = {"datatype": datatype}
-        if production:
-            data_config["production"] = production
-        if period:
-            data_config["period"] = period
-        if extent:
-            data_config["extent"] = extent
-            
-        params = {"data": json.dumps(data_config)}
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/files/production/list",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        data_config = _drop_none({
+            "datatype": datatype,
+            "production": production,
+            "period": period,
+            "extent": extent
+        })
+        params = {"data": serialization.dumps(data_config)}
+        return await self._get(self._url_production_list, params)
     
     async def retrieve_production_file(self, file_path: str) -> Dict[str, Any]:
         """Retrieve a specific production file."""
         params = {"file_path": file_path}
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/files/production/retrieve",
-                params=params,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return {"data": response.content}
+        return await self._get(
+            self._url_production_retrieve, params, timeout=self._TIMEOUT_ZIP, raw=True
+        )
+    
+    async def iter_production_file(
+        self,
+        file_path: str,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream a specific production file in chunks."""
+        params = {"file_path": file_path}
+        async for chunk in self._stream_get(
+            self._url_production_retrieve, params, chunk_size, timeout=self._TIMEOUT_ZIP
+        ):
+            yield chunk
     
     async def get_mesonet_stations(
         self,
@@ -393,16 +687,7 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Get mesonet station information."""
         params = {"location": location}
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/stations",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._cached_get(self._url_mesonet_stations, params, cache=self._roster_cache)
     
     async def get_mesonet_variables(
         self,
@@ -410,16 +695,7 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Get mesonet variable definitions."""
         params = {"location": location}
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/variables",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._cached_get(self._url_mesonet_variables, params, cache=self._roster_cache)
     
     async def get_mesonet_station_monitor(
         self,
@@ -427,16 +703,7 @@ class HCDPClient:
     ) -> Dict[str, Any]:
         """Get mesonet station monitoring data."""
         params = {"location": location}
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/mesonet/db/stationMonitor",
-                params=params,
-                headers=self.headers,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get(self._url_mesonet_station_monitor, params)
     
     async def email_mesonet_measurements(
         self,
@@ -449,27 +716,13 @@ class HCDPClient:
         intervals: Optional[str] = None
     ) -> Dict[str, Any]:
         """Email mesonet measurements as CSV."""
-        payload = {
+        payload = _drop_none({
             "email": email,
-            "location": location
-        }
-        if station_ids:
-            payload["station_ids"] = station_ids
-        if start_date:
-            payload["start_date"] = start_date
-        if end_date:
-            payload["end_date"] = end_date
-        if var_ids:
-            payload["var_ids"] = var_ids
-        if intervals:
-            payload["intervals"] = intervals
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/mesonet/db/measurements/email",
-                json=payload,
-                headers=self.headers,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
\ No newline at end of file
+            "location": location,
+            "station_ids": station_ids,
+            "start_date": start_date,
+            "end_date": end_date,
+            "var_ids": var_ids,
+            "intervals": intervals
+        })
+        return await self._post(self._url_mesonet_email, payload)
@@ -0,0 +1,274 @@
+"""Vectorized station geometry helpers used by the MCP tools."""
+
+import math
+import time
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional speedup
+    njit = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is an optional speedup
+    cKDTree = None
+
+EARTH_RADIUS_KM = 6371.0
+# Below this many stations a linear scan beats building and querying a tree
+KDTREE_MIN_STATIONS = 2048
+# Station rosters change slowly, so an index stays valid for a day
+STATION_INDEX_TTL = 24 * 60 * 60
+
+# (lat_min, lat_max, lng_min, lng_max)
+Bounds = Tuple[float, float, float, float]
+ArrayLike = Union[float, np.ndarray]
+
+
+def haversine_km(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> ArrayLike:
+    """Great-circle distance in km; broadcasts over NumPy arrays."""
+    if isinstance(lat2, (int, float)) and isinstance(lon2, (int, float)):
+        # Scalar pairs skip NumPy's per-call dispatch overhead
+        dlat = math.radians(lat2 - lat1)
+        dlon = math.radians(lon2 - lon1)
+        a = (math.sin(dlat / 2) ** 2
+             + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2))
+             * math.sin(dlon / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+    dlat = np.radians(np.subtract(lat2, lat1))
+    dlon = np.radians(np.subtract(lon2, lon1))
+    a = (np.sin(dlat / 2) ** 2
+         + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def coerce_floats(values: Iterable[Any]) -> np.ndarray:
+    """Convert raw API values to float64, mapping unparseable entries to NaN."""
+    if not isinstance(values, Collection):
+        values = list(values)
+    try:
+        # Numbers, numeric strings and None all convert in one C-level pass,
+        # read straight from sized inputs such as dict views with no list copy
+        return np.fromiter(values, dtype=np.float64, count=len(values))
+    except (TypeError, ValueError):
+        pass
+    # Only listings with a malformed entry pay for per-element parsing
+    out = np.empty(len(values), dtype=np.float64)
+    for i, v in enumerate(values):
+        # Type checks settle numbers and gaps without raising; only
+        # strings and other oddities go through float() under try
+        if isinstance(v, (int, float)):
+            out[i] = v
+        elif v is None:
+            out[i] = np.nan
+        else:
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+    return out
+
+
+def cosine_distance_km(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> ArrayLike:
+    """Great-circle distance in km by the spherical law of cosines.
+
+    About half the transcendental calls of Haversine. It loses precision only
+    for separations well under a metre, far below the km-scale radii used for
+    station matching.
+    """
+    if isinstance(lat2, (int, float)) and isinstance(lon2, (int, float)):
+        p1, p2 = math.radians(lat1), math.radians(lat2)
+        c = (math.sin(p1) * math.sin(p2)
+             + math.cos(p1) * math.cos(p2) * math.cos(math.radians(lon2 - lon1)))
+        return EARTH_RADIUS_KM * math.acos(min(1.0, max(-1.0, c)))
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    c = np.sin(p1) * np.sin(p2) + np.cos(p1) * np.cos(p2) * np.cos(np.radians(np.subtract(lon2, lon1)))
+    return EARTH_RADIUS_KM * np.arccos(np.clip(c, -1.0, 1.0))
+
+
+if njit is not None:
+    # fastmath is left off: its no-NaN assumption would let rows with
+    # missing coordinates match
+    @njit(cache=True)
+    def _radius_scan(lat, sin_lat, cos_lat, lng_rad, q_lat, max_dlat, q_sin, q_cos, q_lng, min_cos, out):  # pragma: no cover
+        """Write indices of rows within the radius to out; return how many."""
+        n = 0
+        for i in range(sin_lat.shape[0]):
+            # Latitude band check first: a row further than the radius in
+            # latitude alone can't be inside it, so skip its cosine. NaN
+            # rows fail this comparison too.
+            if not abs(lat[i] - q_lat) <= max_dlat:
+                continue
+            c = q_sin * sin_lat[i] + q_cos * cos_lat[i] * math.cos(lng_rad[i] - q_lng)
+            if c >= min_cos:
+                out[n] = i
+                n += 1
+        return n
+
+else:
+    _radius_scan = None
+
+
+class PointSet:
+    """Fixed named points stored as parallel name/lat/lng columns."""
+
+    def __init__(self, points: Mapping[str, Mapping[str, float]]):
+        self.names = list(points)
+        self.lat = np.array([p["lat"] for p in points.values()], dtype=np.float64)
+        self.lng = np.array([p["lng"] for p in points.values()], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Tuple[str, float, float]]:
+        """Yield (name, lat, lng) with plain Python floats."""
+        return zip(self.names, self.lat.tolist(), self.lng.tolist())
+
+
+class StationIndex:
+    """Columnar view of a mesonet station listing.
+
+    Coordinates are parsed once when the index is built; rows with missing or
+    malformed coordinates hold NaN and so never match a spatial query.
+    """
+
+    def __init__(self, stations: Sequence[Dict[str, Any]]):
+        self.source = stations
+        self.ids = np.array([s.get("station_id") for s in stations], dtype=object)
+        self.lat = coerce_floats(s.get("lat") for s in stations)
+        self.lng = coerce_floats(s.get("lng") for s in stations)
+        missing_id = np.array([s.get("station_id") is None for s in stations], dtype=bool)
+        self.lat[missing_id] = np.nan
+        # Station-side trig for radius queries, computed once per roster
+        lat_rad = np.radians(self.lat)
+        self._sin_lat = np.sin(lat_rad)
+        self._cos_lat = np.cos(lat_rad)
+        self._lng_rad = np.radians(self.lng)
+        self.built_at = time.monotonic()
+        self._groups: Optional[Dict[str, List[str]]] = None
+        self._groups_key: Optional[Mapping[str, Bounds]] = None
+        self._tree: Any = None
+        self._tree_rows: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def in_bounds(self, bounds: Bounds) -> np.ndarray:
+        """Boolean mask of stations inside a lat/lng bounding box."""
+        lat_min, lat_max, lng_min, lng_max = bounds
+        return (
+            (self.lat >= lat_min) & (self.lat <= lat_max)
+            & (self.lng >= lng_min) & (self.lng <= lng_max)
+        )
+
+    def ids_in_bounds(self, bounds: Bounds) -> List[str]:
+        """Station IDs inside a bounding box, in listing order."""
+        return self.ids[self.in_bounds(bounds)].tolist()
+
+    def ids_by_bounds(self, bounds_by_name: Mapping[str, Bounds]) -> Dict[str, List[str]]:
+        """Station IDs for every named bounding box, computed once per table."""
+        if self._groups is None or self._groups_key is not bounds_by_name:
+            # One broadcast over an (islands x 4) box array yields every mask
+            box = np.array(list(bounds_by_name.values()), dtype=np.float64)
+            box = box.reshape(-1, 4)[:, :, None]
+            masks = (
+                (self.lat >= box[:, 0]) & (self.lat <= box[:, 1])
+                & (self.lng >= box[:, 2]) & (self.lng <= box[:, 3])
+            )
+            self._groups = {
+                name: self.ids[mask].tolist()
+                for name, mask in zip(bounds_by_name, masks)
+            }
+            self._groups_key = bounds_by_name
+        return self._groups
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Boolean mask of stations within radius_km of a point."""
+        # Law of cosines with the station terms precomputed; comparing the
+        # cosine against cos(radius) avoids an arccos per station
+        q_lat = math.radians(lat)
+        c = (math.sin(q_lat) * self._sin_lat
+             + math.cos(q_lat) * self._cos_lat * np.cos(self._lng_rad - math.radians(lng)))
+        return c >= math.cos(radius_km / EARTH_RADIUS_KM)
+
+    def ids_within_radius(self, lat: float, lng: float, radius_km: float) -> List[str]:
+        """Station IDs within radius_km of a point, in listing order."""
+        if cKDTree is not None and len(self) >= KDTREE_MIN_STATIONS:
+            return self.ids[self._tree_within_radius(lat, lng, radius_km)].tolist()
+        if _radius_scan is None:
+            return self.ids[self.within_radius(lat, lng, radius_km)].tolist()
+        # Compiled single pass: trig, comparison and index gather fused with
+        # no temporary arrays
+        q_lat = math.radians(lat)
+        out = np.empty(len(self.ids), dtype=np.intp)
+        # Small slack keeps degree rounding from dropping boundary rows
+        max_dlat = math.degrees(radius_km / EARTH_RADIUS_KM) + 1e-9
+        n = _radius_scan(
+            self.lat, self._sin_lat, self._cos_lat, self._lng_rad, lat, max_dlat,
+            math.sin(q_lat), math.cos(q_lat), math.radians(lng),
+            math.cos(radius_km / EARTH_RADIUS_KM), out
+        )
+        return self.ids[out[:n]].tolist()
+
+    def _tree_within_radius(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Row numbers within radius_km via a k-d tree over unit-sphere xyz."""
+        if self._tree is None:
+            # Built lazily once per roster; NaN rows are left out of the tree
+            rows = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lng))
+            xyz = np.column_stack((
+                self._cos_lat[rows] * np.cos(self._lng_rad[rows]),
+                self._cos_lat[rows] * np.sin(self._lng_rad[rows]),
+                self._sin_lat[rows],
+            ))
+            self._tree, self._tree_rows = cKDTree(xyz), rows
+        q_lat, q_lng = math.radians(lat), math.radians(lng)
+        point = (math.cos(q_lat) * math.cos(q_lng), math.cos(q_lat) * math.sin(q_lng), math.sin(q_lat))
+        # Great-circle radius as a straight-line chord through the sphere
+        chord = 2 * math.sin(radius_km / (2 * EARTH_RADIUS_KM))
+        hits = np.asarray(self._tree.query_ball_point(point, chord), dtype=np.intp)
+        return np.sort(self._tree_rows[hits])
+
+
+def warm_up_jit() -> None:
+    """Compile the numba radius kernel, or load it from numba's disk cache.
+
+    The first call of a jitted function compiles it synchronously; running
+    that at startup keeps the cost out of the first radius query.
+    """
+    if _radius_scan is not None:
+        StationIndex([{"station_id": "warmup", "lat": 0.0, "lng": 0.0}]).ids_within_radius(0.0, 0.0, 1.0)
+
+
+_index_cache: Dict[str, StationIndex] = {}
+
+
+def _same_rows(a: Sequence[Any], b: Sequence[Any]) -> bool:
+    """True when two listings hold the very same row objects, in order."""
+    return a is b or (len(a) == len(b) and all(x is y for x, y in zip(a, b)))
+
+
+def station_index(stations: Sequence[Dict[str, Any]], location: str = "hawaii") -> StationIndex:
+    """Return the cached index for a location, rebuilding it when the roster changes.
+
+    The client's roster cache hands out copies of one cached listing, so the
+    index is reused for as long as that entry lives and rebuilt as soon as
+    it is refreshed. STATION_INDEX_TTL bounds the age of an index either way.
+    """
+    index = _index_cache.get(location)
+    if (
+        index is not None
+        and time.monotonic() - index.built_at < STATION_INDEX_TTL
+        and _same_rows(index.source, stations)
+    ):
+        return index
+    index = StationIndex(stations)
+    if len(index):
+        _index_cache[location] = index
+    return index
+
+
+def clear_station_index() -> None:
+    """Drop all cached station indexes."""
+    _index_cache.clear()
@@ -0,0 +1,87 @@
+"""JSON and base64 encoding helpers backed by orjson and, when installed, pybase64."""
+
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - no orjson wheels on non-CPython builds
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import pybase64
+except ImportError:  # pragma: no cover - pybase64 is an optional speedup
+    pybase64 = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder: NumPy values become plain Python, anything else a string."""
+    encode = _ENCODERS.get(type(obj))
+    if encode is not None:
+        return encode(obj)
+    if type(obj).__module__ == "numpy":
+        return obj.tolist()
+    if isinstance(obj, bytes):
+        # Base64 rather than a lossy, several-times-larger str(b"...") repr
+        return b64encode(obj)
+    if isinstance(obj, (date, time)):
+        # ISO 8601, matching how orjson writes dates natively
+        return obj.isoformat()
+    return str(obj)
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+    _PRETTY_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse a JSON document from bytes or str."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a compact JSON string."""
+        return orjson.dumps(obj).decode()
+
+    def dumps_pretty(obj: Any) -> str:
+        """Serialize an object to indented JSON for tool output."""
+        return orjson.dumps(obj, default=_default, option=_PRETTY_OPTIONS).decode()
+
+else:
+    JSONDecodeError = json.JSONDecodeError  # type: ignore[misc]
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse a JSON document from bytes or str."""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a compact JSON string."""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_pretty(obj: Any) -> str:
+        """Serialize an object to indented JSON for tool output."""
+        return json.dumps(obj, indent=2, default=_default)
+
+
+if pybase64 is not None:
+
+    def b64encode(data: bytes) -> str:
+        """Base64-encode binary data to an ASCII string (SIMD-accelerated)."""
+        return pybase64.b64encode_as_string(data)
+
+else:
+
+    def b64encode(data: bytes) -> str:
+        """Base64-encode binary data to an ASCII string."""
+        return base64.b64encode(data).decode("ascii")
+
+
+# Exact-type encoders for what tool results actually carry, looked up
+# before the isinstance chain in _default
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    bytes: b64encode,
+    date: date.isoformat,
+    datetime: datetime.isoformat,
+    time: time.isoformat,
+}
@@ -1,24 +1,39 @@
 """HCDP MCP Server - Main server implementation."""
 
 import asyncio
-import base64
-import json
-import math
-from typing import Any, Sequence, Dict, List, Optional
+import calendar
+import inspect
+import itertools
+import os
+import time
+import numpy as np
+from typing import Annotated, Any, Sequence, Dict, List, Optional
 from datetime import datetime, timedelta
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.lowlevel.server import NotificationOptions
 from mcp.server.stdio import stdio_server
 from mcp.types import (
+    BlobResourceContents,
     Resource,
     Tool,
     TextContent,
     ImageContent,
     EmbeddedResource,
+    ListToolsRequest,
+    ListToolsResult,
 )
-from pydantic import BaseModel, Field, field_validator
-from .client import HCDPClient
+from pydantic import BeforeValidator, Field, TypeAdapter
+from pydantic.dataclasses import dataclass
+
+from . import serialization
+from .client import HCDPClient, configure
+from .geo import PointSet, coerce_floats, haversine_km, station_index, warm_up_jit
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is an optional speedup
+    uvloop = None
 
 # Constants for Location Data
 ISLAND_EXTENTS = {
@@ -31,6 +46,17 @@ ISLAND_EXTENTS = {
     "statewide": "statewide"
 }
 
+# Approximate Bounding Boxes (Lat Min, Lat Max, Lng Min, Lng Max)
+ISLAND_BOUNDS = {
+    "oahu": (21.2, 21.8, -158.3, -157.6),
+    "big_island": (18.9, 20.3, -156.1, -154.8),
+    "maui": (20.5, 21.1, -156.7, -155.9),
+    "kauai": (21.8, 22.3, -159.8, -159.2),
+    "molokai": (21.0, 21.3, -157.3, -156.7),
+    "lanai": (20.7, 21.0, -157.0, -156.8)
+}
+
+# Keys are lowercase; city arguments are lowercased during validation
 CITY_LOCATIONS = {
     # Main Hawaiian Islands
     "honolulu": {"lat": 21.3069, "lng": -157.8583, "island": "oahu"},
@@ -89,22 +115,160 @@ ISLAND_REPRESENTATIVE_POINTS = {
     }
 }
 
+# Column-oriented copies of the representative points, built once at import
+ISLAND_POINT_SETS = {
+    island: PointSet(points) for island, points in ISLAND_REPRESENTATIVE_POINTS.items()
+}
+
+# Tool datatype -> (timeseries datatype, production, aggregation, period)
+TIMESERIES_PARAMS = {
+    "temperature": ("temp_mean", None, "month", None),
+    "rainfall": ("rainfall", "new", None, "month"),
+    "precipitation": ("rainfall", "new", None, "month"),
+}
+
+
+def timeseries_params(datatype):
+    """Timeseries request parameters for a tool datatype; others aggregate monthly."""
+    return TIMESERIES_PARAMS.get(datatype, (datatype, None, "month", None))
+
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calculate Haversine distance between two points in km."""
-    R = 6371  # Earth radius in km
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2) * math.sin(dlat/2) + \
-        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
-        math.sin(dlon/2) * math.sin(dlon/2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
-
-class GetClimateRasterArgs(BaseModel):
+    return haversine_km(lat1, lon1, lat2, lon2)
+
+
+# Cached YYYY-MM-DD for today; refreshed at most once a minute and at midnight
+_today = {"date": "", "expires": 0.0}
+
+
+def today_str():
+    """Today's local date as YYYY-MM-DD without re-formatting on every call."""
+    now = time.time()
+    if now >= _today["expires"]:
+        current = datetime.now()
+        midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        _today["date"] = current.strftime("%Y-%m-%d")
+        _today["expires"] = min(now + 60, midnight.timestamp())
+    return _today["date"]
+
+
+# Stations per mesonet request when fanning out; small batches let the API
+# work on several at once while still amortizing round trips
+MESONET_BATCH_SIZE = 10
+
+
+# Default cap on concurrent API requests per tool call (HCDP_MAX_CONCURRENCY)
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def max_concurrency():
+    """Concurrent API requests allowed per tool call."""
+    try:
+        return max(1, int(os.getenv("HCDP_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENCY
+
+
+async def gather_limited(aws, return_exceptions=False):
+    """asyncio.gather with at most max_concurrency() awaitables running at once."""
+    semaphore = asyncio.Semaphore(max_concurrency())
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+async def fetch_station_measurements(client, station_ids, datatype, date):
+    """Fetch one day's measurements for many stations in concurrent batches."""
+    # The API takes comma-separated IDs, so each batch is joined exactly once
+    batches = [
+        ",".join(station_ids[i:i + MESONET_BATCH_SIZE])
+        for i in range(0, len(station_ids), MESONET_BATCH_SIZE)
+    ]
+    results = await gather_limited(
+        client.get_mesonet_data(
+            station_ids=batch,
+            start_date=date,
+            end_date=date,
+            var_ids=datatype,
+            limit=100,
+            # Only the reading itself is aggregated, so skip the per-row
+            # station/variable metadata the API would otherwise join in
+            join_metadata=False
+        )
+        for batch in batches
+    )
+    return list(itertools.chain.from_iterable(results))
+
+
+# Fill value the HCDP API uses for missing data
+MISSING_VALUE = -9999
+
+
+def valid_values(values):
+    """Float array of values with unparseable, non-finite and fill entries dropped."""
+    vals = coerce_floats(values)
+    return vals[np.isfinite(vals) & (vals != MISSING_VALUE)]
+
+
+def measurement_values(measurements, datatype):
+    """Numeric readings of datatype as a float array, unparseable values dropped."""
+    return valid_values(m[datatype] for m in measurements if datatype in m)
+
+
+def _to_float(v):
+    """Convert string coordinates to floats."""
+    if v is None or v == '':
+        return None
+    if isinstance(v, str):
+        return float(v)
+    return v
+
+
+# Coordinates may arrive as strings; the cast is part of the core schema
+# rather than a separate field-validator hook. Strings stay in the advertised
+# input schema, but after the cast the core only has to check float | None.
+Coordinate = Annotated[float | None, BeforeValidator(_to_float, json_schema_input_type=float | str | None)]
+
+
+def _to_lower(v):
+    """Lowercase string input so it matches the lowercase lookup tables."""
+    return v.lower() if isinstance(v, str) else v
+
+
+# City names are normalized once at validation time
+CityName = Annotated[str, BeforeValidator(_to_lower)]
+
+# Common names accepted in place of API codes
+EXTENT_ALIASES = {**ISLAND_EXTENTS, "big island": "bi", "hawaii county": "bi"}
+DATATYPE_ALIASES = {
+    "precipitation": "rainfall",
+    "temperature": "temp_mean",
+    "mean temperature": "temp_mean",
+}
+
+
+def _alias(table):
+    """Before-validator mapping a common name onto its API code, else passing it through."""
+    def to_code(v):
+        return table.get(v.lower(), v) if isinstance(v, str) else v
+    return BeforeValidator(to_code)
+
+
+# Extents and datatypes are resolved to API codes once at validation time
+ExtentCode = Annotated[str, _alias(EXTENT_ALIASES)]
+DatatypeCode = Annotated[str, _alias(DATATYPE_ALIASES)]
+
+
+@dataclass(slots=True)
+class GetClimateRasterArgs:
     """Arguments for getting climate raster data."""
-    datatype: str = Field(description="Climate variable: 'rainfall' (or 'precipitation'), 'temp_mean' (or 'temperature', 'mean temperature'), 'temp_min' (minimum temperature), 'temp_max' (maximum temperature), 'rh' (relative humidity)")
+    datatype: DatatypeCode = Field(description="Climate variable: 'rainfall' (or 'precipitation'), 'temp_mean' (or 'temperature', 'mean temperature'), 'temp_min' (minimum temperature), 'temp_max' (maximum temperature), 'rh' (relative humidity)")
     date: str = Field(description="Date in YYYY-MM format (e.g., '2024-01' for January 2024, '2022-02' for February 2022). Use current/recent dates for latest data.")
-    extent: str = Field(description="Spatial extent code: 'bi' (Big Island/Hawaii County), 'oa' (Oahu/Honolulu County), 'ka' (Kauai County), 'mn' (Maui County), or 'statewide' (all islands)")
+    extent: ExtentCode = Field(description="Spatial extent code: 'bi' (Big Island/Hawaii County), 'oa' (Oahu/Honolulu County), 'ka' (Kauai County), 'mn' (Maui County), or 'statewide' (all islands)")
     location: str = Field(default="hawaii", description="Location ('hawaii' or 'american_samoa')")
     production: str | None = Field(default=None, description="Production level for RAINFALL only. Use 'new' for recent/preliminary data, 'final' for validated data. Required for rainfall queries.")
     aggregation: str | None = Field(default=None, description="Temporal aggregation for TEMPERATURE data. Use 'month' for monthly averages. Required for temperature queries.")
@@ -112,39 +276,32 @@ class GetClimateRasterArgs(BaseModel):
     period: str | None = Field(default=None, description="Period specification")
 
 
-class GetTimeseriesArgs(BaseModel):
+@dataclass(slots=True)
+class GetTimeseriesArgs:
     """Arguments for getting time series data."""
-    datatype: str = Field(description="Climate data type")
+    datatype: DatatypeCode = Field(description="Climate data type")
     start: str = Field(description="Start date in YYYY-MM-DD format")
     end: str = Field(description="End date in YYYY-MM-DD format")
-    extent: str = Field(description="Spatial extent code: 'bi' (Big Island/Hawaii County), 'oa' (Oahu/Honolulu County), 'ka' (Kauai County), 'mn' (Maui County), or 'statewide' (all islands)")
-    lat: float | str | None = Field(default=None, description="Latitude coordinate (optional)")
-    lng: float | str | None = Field(default=None, description="Longitude coordinate (optional)")
+    extent: ExtentCode = Field(description="Spatial extent code: 'bi' (Big Island/Hawaii County), 'oa' (Oahu/Honolulu County), 'ka' (Kauai County), 'mn' (Maui County), or 'statewide' (all islands)")
+    lat: Coordinate = Field(default=None, description="Latitude coordinate (optional)")
+    lng: Coordinate = Field(default=None, description="Longitude coordinate (optional)")
     location: str = Field(default="hawaii", description="Location ('hawaii' or 'american_samoa')")
     production: str | None = Field(default=None, description="Production level (optional)")
     aggregation: str | None = Field(default=None, description="Temporal aggregation (optional)")
     timescale: str | None = Field(default=None, description="Timescale (optional)")
     period: str | None = Field(default=None, description="Period specification (optional)")
 
-    @field_validator('lat', 'lng', mode='before')
-    @classmethod
-    def convert_to_float(cls, v):
-        """Convert string coordinates to floats."""
-        if v is None or v == '':
-            return None
-        if isinstance(v, str):
-            return float(v)
-        return v
-
 
-class GetStationDataArgs(BaseModel):
+@dataclass(slots=True)
+class GetStationDataArgs:
     """Arguments for getting station data."""
     q: str = Field(description="Query parameter for station search")
     limit: int | None = Field(default=None, description="Limit number of results (optional)")
     offset: int | None = Field(default=None, description="Offset for pagination (optional)")
 
 
-class GetMesonetDataArgs(BaseModel):
+@dataclass(slots=True)
+class GetMesonetDataArgs:
     """Arguments for getting mesonet data."""
     station_ids: str | None = Field(default=None, description="Comma-separated station IDs (optional)")
     start_date: str | None = Field(default=None, description="Start date in YYYY-MM-DD format (optional)")
@@ -157,7 +314,8 @@ class GetMesonetDataArgs(BaseModel):
     join_metadata: bool = Field(default=True, description="Include metadata in results")
 
 
-class GenerateDataPackageEmailArgs(BaseModel):
+@dataclass(slots=True)
+class GenerateDataPackageEmailArgs:
     """Arguments for generating data packages via email."""
     email: str = Field(description="Email address for package delivery")
     datatype: str = Field(description="Climate data type")
@@ -170,7 +328,8 @@ class GenerateDataPackageEmailArgs(BaseModel):
     zipName: str | None = Field(default=None, description="Custom zip file name (optional)")
 
 
-class GenerateDataPackageInstantArgs(BaseModel):
+@dataclass(slots=True)
+class GenerateDataPackageInstantArgs:
     """Arguments for generating instant data packages."""
     email: str = Field(description="Email address for logging")
     datatype: str = Field(description="Climate data type")
@@ -182,7 +341,8 @@ class GenerateDataPackageInstantArgs(BaseModel):
     zipName: str | None = Field(default=None, description="Custom zip file name (optional)")
 
 
-class ListProductionFilesArgs(BaseModel):
+@dataclass(slots=True)
+class ListProductionFilesArgs:
     """Arguments for listing production files."""
     datatype: str = Field(description="Climate data type")
     production: str | None = Field(default=None, description="Production level (optional)")
@@ -190,52 +350,61 @@ class ListProductionFilesArgs(BaseModel):
     extent: str | None = Field(default=None, description="Spatial extent (optional)")
 
 
-class RetrieveProductionFileArgs(BaseModel):
+@dataclass(slots=True)
+class RetrieveProductionFileArgs:
     """Arguments for retrieving a production file."""
     file_path: str = Field(description="Path to the file to retrieve")
 
 
-class GetMesonetStationsArgs(BaseModel):
+@dataclass(slots=True)
+class GetMesonetStationsArgs:
     """Arguments for getting mesonet station info."""
     location: str = Field(default="hawaii", description="Location")
 
 
-class GetMesonetVariablesArgs(BaseModel):
+@dataclass(slots=True)
+class GetMesonetVariablesArgs:
     """Arguments for getting mesonet variable definitions."""
     location: str = Field(default="hawaii", description="Location")
 
 
-class GetMesonetStationMonitorArgs(BaseModel):
+@dataclass(slots=True)
+class GetMesonetStationMonitorArgs:
     """Arguments for getting mesonet station monitoring data."""
     location: str = Field(default="hawaii", description="Location")
 
 
-class GetIslandSummaryArgs(BaseModel):
+@dataclass(slots=True)
+class GetIslandSummaryArgs:
     """Arguments for island-wide weather summary."""
     island: str = Field(description="Island name: 'oahu', 'big_island', 'maui', 'kauai', 'molokai', 'lanai'")
     datatype: str = Field(description="Variable to summarize (e.g., 'temperature', 'rainfall', 'humidity')")
 
 
-class GetCityWeatherArgs(BaseModel):
+@dataclass(slots=True)
+class GetCityWeatherArgs:
     """Arguments for city-specific weather."""
-    city: str = Field(description="City name: 'honolulu', 'hilo', 'kona', 'kahului', 'lihue', 'pago_pago'")
+    city: CityName = Field(description="City name: 'honolulu', 'hilo', 'kona', 'kahului', 'lihue', 'pago_pago'")
     datatype: str = Field(description="Variable to retrieve (e.g., 'temperature', 'rainfall')")
 
 
-class CompareHistoryArgs(BaseModel):
+@dataclass(slots=True)
+class CompareHistoryArgs:
     """Arguments for comparing current vs historical weather."""
-    city: str = Field(description="City name: 'honolulu', 'hilo', 'kona', 'kahului', 'lihue', 'pago_pago'")
+    city: CityName = Field(description="City name: 'honolulu', 'hilo', 'kona', 'kahului', 'lihue', 'pago_pago'")
     datatype: str = Field(description="Variable to compare (e.g., 'temperature', 'rainfall')")
 
 
-class GetIslandHistoryArgs(BaseModel):
+@dataclass(slots=True)
+class GetIslandHistoryArgs:
     """Arguments for island history summary."""
     island: str = Field(description="Island name: 'oahu', 'big_island', 'maui', 'kauai', 'molokai', 'lanai'")
     datatype: str = Field(description="Variable: 'rainfall', 'temperature'")
     year: str = Field(description="Year to summarize, e.g. '2024'")
 
 
-class EmailMesonetMeasurementsArgs(BaseModel):
+@dataclass(slots=True)
+class EmailMesonetMeasurementsArgs:
     """Arguments for emailing mesonet measurements."""
     email: str = Field(description="Email address for CSV delivery")
     location: str = Field(default="hawaii", description="Location")
@@ -249,679 +418,693 @@ class EmailMesonetMeasurementsArgs(BaseModel):
 app = Server("hcdp-mcp-server")
 
 
-@app.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        # Tool(
-        #     name="get_climate_raster",
-        #     description="""Retrieve climate raster data (GeoTIFF maps) from HCDP.
-        #     
-        #     Use this for queries like:
-        #     - 'Get rainfall data for Big Island in February 2022'
-        #     - 'Show me temperature data for Oahu last month'
-        #     - 'Download precipitation map for statewide Hawaii'
-        #     
-        #     Key parameters:
-        #     - datatype: 'rainfall' (requires production='new' and period='month'), 'temp_mean'/'temp_min'/'temp_max' (requires aggregation='month'), 'rh' (relative humidity)
-        #     - extent: Use 'bi' (Big Island), 'oa' (Oahu), 'ka' (Kauai), 'mn' (Maui County), or 'statewide'
-        #     - date: YYYY-MM format (e.g., '2024-01')
-        #     """,
-        #     inputSchema=GetClimateRasterArgs.model_json_schema(),
-        # ),
-        Tool(
-            name="get_timeseries_data", 
-            description="""Get time series climate data for specific coordinates.
-            
-            REQUIRED: You MUST provide 'lat' and 'lng' arguments.
-            DO NOT provide 'extent' (e.g., 'oa', 'bi') - this tool works on specific points only.
-            
-            Use this for: "History for Hilo", "Trends at 21.3, -157.8", "Temperature for Honolulu".
-            """,
-            inputSchema=GetTimeseriesArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_station_data",
-            description="Retrieve station-specific climate measurements and metadata",
-            inputSchema=GetStationDataArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_data",
-            description="Access real-time weather station (mesonet) measurements",
-            inputSchema=GetMesonetDataArgs.model_json_schema(),
-        ),
-        # Tool(
-        #     name="generate_data_package_email",
-        #     description="Generate downloadable zip packages of climate data and email them",
-        #     inputSchema=GenerateDataPackageEmailArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="generate_data_package_instant_link",
-        #     description="Generate instant download links for climate data packages",
-        #     inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="generate_data_package_instant_content",
-        #     description="Generate instant download content for climate data packages",
-        #     inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="generate_data_package_splitlink",
-        #     description="Generate split download links for large climate data packages",
-        #     inputSchema=GenerateDataPackageInstantArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="list_production_files",
-        #     description="List available production climate data files",
-        #     inputSchema=ListProductionFilesArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="retrieve_production_file",
-        #     description="Retrieve a specific production climate data file",
-        #     inputSchema=RetrieveProductionFileArgs.model_json_schema(),
-        # ),
-        Tool(
-            name="get_island_current_summary",
-            description="""Get a weather summary for an entire island (Average/Min/Max).
-            
-            Aggregates real-time data from all active Mesonet stations on the island.
-            Use this for: "What's the average temperature on Oahu?" or "How much rain on Big Island?"
-            """,
-            inputSchema=GetIslandSummaryArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_city_current_weather",
-            description="""Get aggregated current weather for a specific city.
-            
-            Finds stations within ~15km of the city and averages their data.
-            Supported cities: Honolulu, Hilo, Kona, Kahului, Lihue, Kaunakakai, Lanai City, Pago Pago.
-            """,
-            inputSchema=GetCityWeatherArgs.model_json_schema(),
-        ),
-        Tool(
-            name="compare_current_vs_historical",
-            description="""Compare current weather to historical averages.
-            
-            Compares today's Mesonet data (city average) vs. historical Timeseries data (previous year, same month).
-            returns the difference (e.g., "+1.5C warmer than normal").
-            """,
-            inputSchema=CompareHistoryArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_island_history_summary",
-            description="""Get historical weather patterns for an entire island (Parallelized).
-            
-            Fetches history for ~5 representative locations (Windward, Leeward, Mauka, Makai) simultaneously.
-            Use this for: "Rainfall patterns for Oahu in 2024" or "Where was it hottest on Maui last year?"
-            """,
-            inputSchema=GetIslandHistoryArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_stations",
-            description="""List available mesonet weather stations in Hawaii.
-            
-            Use this for queries like:
-            - 'Show me all weather stations in Hawaii'
-            - 'List mesonet stations'
-            - 'What weather stations are available?'
-            
-            Returns station metadata including location, elevation, and available variables.
-            """,
-            inputSchema=GetMesonetStationsArgs.model_json_schema(),
-        ),
-        Tool(
-            name="get_mesonet_variables",
-            description="""List available weather measurement variables from mesonet stations.
-            
-            Use this for queries like:
-            - 'What weather variables can I measure?'
-            - 'Show me available mesonet data types'
-            - 'What measurements do weather stations collect?'
-            
-            Returns variables like temperature, humidity, wind speed, rainfall, etc.
-            """,
-            inputSchema=GetMesonetVariablesArgs.model_json_schema(),
-        ),
-        # Tool(
-        #     name="get_mesonet_station_monitor",
-        #     description="Get mesonet station monitoring and status data",
-        #     inputSchema=GetMesonetStationMonitorArgs.model_json_schema(),
-        # ),
-        # Tool(
-        #     name="email_mesonet_measurements",
-        #     description="Email mesonet measurement data as CSV files",
-        #     inputSchema=EmailMesonetMeasurementsArgs.model_json_schema(),
-        # ),
-    ]
+# Tool definitions (and their pydantic JSON schemas) are built once at import
+TOOLS: list[Tool] = [
+    # Tool(
+    #     name="get_climate_raster",
+    #     description="""Retrieve climate raster data (GeoTIFF maps) from HCDP.
+    #     
+    #     Use this for queries like:
+    #     - 'Get rainfall data for Big Island in February 2022'
+    #     - 'Show me temperature data for Oahu last month'
+    #     - 'Download precipitation map for statewide Hawaii'
+    #     
+    #     Key parameters:
+    #     - datatype: 'rainfall' (requires production='new' and period='month'), 'temp_mean'/'temp_min'/'temp_max' (requires aggregation='month'), 'rh' (relative humidity)
+    #     - extent: Use 'bi' (Big Island), 'oa' (Oahu), 'ka' (Kauai), 'mn' (Maui County), or 'statewide'
+    #     - date: YYYY-MM format (e.g., '2024-01')
+    #     """,
+    #     inputSchema=TypeAdapter(GetClimateRasterArgs).json_schema(),
+    # ),
+    Tool(
+        name="get_timeseries_data", 
+        description="""Get time series climate data for specific coordinates.
+        
+        REQUIRED: You MUST provide 'lat' and 'lng' arguments.
+        DO NOT provide 'extent' (e.g., 'oa', 'bi') - this tool works on specific points only.
+        
+        Use this for: "History for Hilo", "Trends at 21.3, -157.8", "Temperature for Honolulu".
+        """,
+        inputSchema=TypeAdapter(GetTimeseriesArgs).json_schema(),
+    ),
+    Tool(
+        name="get_station_data",
+        description="Retrieve station-specific climate measurements and metadata",
+        inputSchema=TypeAdapter(GetStationDataArgs).json_schema(),
+    ),
+    Tool(
+        name="get_mesonet_data",
+        description="Access real-time weather station (mesonet) measurements",
+        inputSchema=TypeAdapter(GetMesonetDataArgs).json_schema(),
+    ),
+    # Tool(
+    #     name="generate_data_package_email",
+    #     description="Generate downloadable zip packages of climate data and email them",
+    #     inputSchema=TypeAdapter(GenerateDataPackageEmailArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="generate_data_package_instant_link",
+    #     description="Generate instant download links for climate data packages",
+    #     inputSchema=TypeAdapter(GenerateDataPackageInstantArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="generate_data_package_instant_content",
+    #     description="Generate instant download content for climate data packages",
+    #     inputSchema=TypeAdapter(GenerateDataPackageInstantArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="generate_data_package_splitlink",
+    #     description="Generate split download links for large climate data packages",
+    #     inputSchema=TypeAdapter(GenerateDataPackageInstantArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="list_production_files",
+    #     description="List available production climate data files",
+    #     inputSchema=TypeAdapter(ListProductionFilesArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="retrieve_production_file",
+    #     description="Retrieve a specific production climate data file",
+    #     inputSchema=TypeAdapter(RetrieveProductionFileArgs).json_schema(),
+    # ),
+    Tool(
+        name="get_island_current_summary",
+        description="""Get a weather summary for an entire island (Average/Min/Max).
+        
+        Aggregates real-time data from all active Mesonet stations on the island.
+        Use this for: "What's the average temperature on Oahu?" or "How much rain on Big Island?"
+        """,
+        inputSchema=TypeAdapter(GetIslandSummaryArgs).json_schema(),
+    ),
+    Tool(
+        name="get_city_current_weather",
+        description="""Get aggregated current weather for a specific city.
+        
+        Finds stations within ~15km of the city and averages their data.
+        Supported cities: Honolulu, Hilo, Kona, Kahului, Lihue, Kaunakakai, Lanai City, Pago Pago.
+        """,
+        inputSchema=TypeAdapter(GetCityWeatherArgs).json_schema(),
+    ),
+    Tool(
+        name="compare_current_vs_historical",
+        description="""Compare current weather to historical averages.
+        
+        Compares today's Mesonet data (city average) vs. historical Timeseries data (previous year, same month).
+        returns the difference (e.g., "+1.5C warmer than normal").
+        """,
+        inputSchema=TypeAdapter(CompareHistoryArgs).json_schema(),
+    ),
+    Tool(
+        name="get_island_history_summary",
+        description="""Get historical weather patterns for an entire island (Parallelized).
+        
+        Fetches history for ~5 representative locations (Windward, Leeward, Mauka, Makai) simultaneously.
+        Use this for: "Rainfall patterns for Oahu in 2024" or "Where was it hottest on Maui last year?"
+        """,
+        inputSchema=TypeAdapter(GetIslandHistoryArgs).json_schema(),
+    ),
+    Tool(
+        name="get_mesonet_stations",
+        description="""List available mesonet weather stations in Hawaii.
+        
+        Use this for queries like:
+        - 'Show me all weather stations in Hawaii'
+        - 'List mesonet stations'
+        - 'What weather stations are available?'
+        
+        Returns station metadata including location, elevation, and available variables.
+        """,
+        inputSchema=TypeAdapter(GetMesonetStationsArgs).json_schema(),
+    ),
+    Tool(
+        name="get_mesonet_variables",
+        description="""List available weather measurement variables from mesonet stations.
+        
+        Use this for queries like:
+        - 'What weather variables can I measure?'
+        - 'Show me available mesonet data types'
+        - 'What measurements do weather stations collect?'
+        
+        Returns variables like temperature, humidity, wind speed, rainfall, etc.
+        """,
+        inputSchema=TypeAdapter(GetMesonetVariablesArgs).json_schema(),
+    ),
+    # Tool(
+    #     name="get_mesonet_station_monitor",
+    #     description="Get mesonet station monitoring and status data",
+    #     inputSchema=TypeAdapter(GetMesonetStationMonitorArgs).json_schema(),
+    # ),
+    # Tool(
+    #     name="email_mesonet_measurements",
+    #     description="Email mesonet measurement data as CSV files",
+    #     inputSchema=TypeAdapter(EmailMesonetMeasurementsArgs).json_schema(),
+    # ),
+]
 
+# Descriptions are written indented inside the list above; dedent them once
+# here so list_tools responses don't carry the source indentation
+for _tool in TOOLS:
+    _tool.description = inspect.cleandoc(_tool.description)
+del _tool
 
-@app.call_tool()
-async def handle_call_tool(name: str, arguments: dict) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
-    """Handle tool calls."""
-    client = HCDPClient()
-    
-    try:
-        # if name == "get_climate_raster":
-        #     args = GetClimateRasterArgs(**arguments)
-        #     result = await client.get_raster_data(
-        #         datatype=args.datatype,
-        #         date=args.date,
-        #         extent=args.extent,
-        #         location=args.location,
-        #         production=args.production,
-        #         aggregation=args.aggregation,
-        #         timescale=args.timescale,
-        #         period=args.period
-        #     )
-        #     
-        if name == "get_timeseries_data":
-            args = GetTimeseriesArgs(**arguments)
-            result = await client.get_timeseries_data(
-                datatype=args.datatype,
-                start=args.start,
-                end=args.end,
-                extent=args.extent,
-                lat=args.lat,
-                lng=args.lng,
-                location=args.location,
-                production=args.production,
-                aggregation=args.aggregation,
-                timescale=args.timescale,
-                period=args.period
-            )
-            
-        elif name == "get_station_data":
-            args = GetStationDataArgs(**arguments)
-            result = await client.get_station_data(
-                q=args.q,
-                limit=args.limit,
-                offset=args.offset
-            )
-            
-        elif name == "get_mesonet_data":
-            args = GetMesonetDataArgs(**arguments)
-            result = await client.get_mesonet_data(
-                station_ids=args.station_ids,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                var_ids=args.var_ids,
-                location=args.location,
-                intervals=args.intervals,
-                limit=args.limit,
-                offset=args.offset,
-                join_metadata=args.join_metadata
-            )
-            
-        # elif name == "generate_data_package_email":
-        #     args = GenerateDataPackageEmailArgs(**arguments)
-        #     result = await client.generate_data_package_email(
-        #         email=args.email,
-        #         datatype=args.datatype,
-        #         production=args.production,
-        #         period=args.period,
-        #         extent=args.extent,
-        #         start_date=args.start_date,
-        #         end_date=args.end_date,
-        #         files=args.files,
-        #         zipName=args.zipName
-        #     )
-        #     
-        # elif name == "generate_data_package_instant_link":
-        #     args = GenerateDataPackageInstantArgs(**arguments)
-        #     result = await client.generate_data_package_instant_link(
-        #         email=args.email,
-        #         datatype=args.datatype,
-        #         production=args.production,
-        #         period=args.period,
-        #         extent=args.extent,
-        #         start_date=args.start_date,
-        #         end_date=args.end_date,
-        #         zipName=args.zipName
-        #     )
-        #     
-        # elif name == "generate_data_package_instant_content":
-        #     args = GenerateDataPackageInstantArgs(**arguments)
-        #     result = await client.generate_data_package_instant_content(
-        #         email=args.email,
-        #         datatype=args.datatype,
-        #         production=args.production,
-        #         period=args.period,
-        #         extent=args.extent,
-        #         start_date=args.start_date,
-        #         end_date=args.end_date,
-        #         zipName=args.zipName
-        #     )
-        #     
-        # elif name == "generate_data_package_splitlink":
-        #     args = GenerateDataPackageInstantArgs(**arguments)
-        #     result = await client.generate_data_package_splitlink(
-        #         email=args.email,
-        #         datatype=args.datatype,
-        #         production=args.production,
-        #         period=args.period,
-        #         extent=args.extent,
-        #         start_date=args.start_date,
-        #         end_date=args.end_date,
-        #         zipName=args.zipName
-        #     )
-        #     
-        # elif name == "list_production_files":
-        #     args = ListProductionFilesArgs(**arguments)
-        #     result = await client.list_production_files(
-        #         datatype=args.datatype,
-        #         production=args.production,
-        #         period=args.period,
-        #         extent=args.extent
-        #     )
-        #     
-        # elif name == "retrieve_production_file":
-        #     args = RetrieveProductionFileArgs(**arguments)
-        #     result = await client.retrieve_production_file(
-        #         file_path=args.file_path
-        #     )
-        #     
-        elif name == "get_mesonet_stations":
-            args = GetMesonetStationsArgs(**arguments)
-            result = await client.get_mesonet_stations(
-                location=args.location
-            )
-            
-        elif name == "get_mesonet_variables":
-            args = GetMesonetVariablesArgs(**arguments)
-            result = await client.get_mesonet_variables(
-                location=args.location
-            )
-            
-        # elif name == "get_mesonet_station_monitor":
-        #     args = GetMesonetStationMonitorArgs(**arguments)
-        #     result = await client.get_mesonet_station_monitor(
-        #         location=args.location
-        #     )
-        #     
-        # elif name == "email_mesonet_measurements":
-        #     args = EmailMesonetMeasurementsArgs(**arguments)
-        #     result = await client.email_mesonet_measurements(
-        #         email=args.email,
-        #         location=args.location,
-        #         station_ids=args.station_ids,
-        #         start_date=args.start_date,
-        #         end_date=args.end_date,
-        #         var_ids=args.var_ids,
-        #         intervals=args.intervals
-        #     )
-
-        elif name == "get_island_current_summary":
-            args = GetIslandSummaryArgs(**arguments)
-            # 1. Get all stations
-            stations = await client.get_mesonet_stations()
-            if "error" in stations:
-                raise ValueError(f"Failed to fetch stations: {stations['error']}")
-                
-            # 2. Filter by island
-            target_island = args.island.lower()
-            if target_island not in ISLAND_EXTENTS:
-                raise ValueError(f"Unknown island: {target_island}")
-                
-            # Simple bounding box filtering could be added here, but for now we'll imply coverage
-            # In a real implementation we'd filter by lat/lng bounds for each island
-            # For this MVP, we will request data for ALL stations and then filter results if needed
-            # But get_mesonet_data takes station_ids. Let's get station IDs first.
-            
-            # 3. Get list of station IDs
-            station_ids = []
-            matching_stations = 0
-            
-            # Since we can't easily map stations to islands by ID alone in the listing,
-            # we'll use a rough lat/lng bounding box or just fetch data for ALL and filter.
-            # But fetching data for 1000+ stations is slow.
-            # Let's use a known subset or just the top 50 reported by the API for now.
-            # OPTIMIZATION: In a real app we'd cache the station-to-island mapping.
-            # For this MVP, let's just get the first 50 available stations and check if they're on the island.
-            # Actually, `get_mesonet_stations` returns lat/lng. We can filter by bounding box!
-            
-            # Approximate Bounding Boxes (Lat Min, Lat Max, Lng Min, Lng Max)
-            BOUNDS = {
-                "oahu": (21.2, 21.8, -158.3, -157.6),
-                "big_island": (18.9, 20.3, -156.1, -154.8),
-                "maui": (20.5, 21.1, -156.7, -155.9),
-                "kauai": (21.8, 22.3, -159.8, -159.2),
-                "molokai": (21.0, 21.3, -157.3, -156.7),
-                "lanai": (20.7, 21.0, -157.0, -156.8)
-            }
-            
-            bounds = BOUNDS.get(target_island)
-            if not bounds:
-                # Fallback: Just take first 20 stations if bounds unknown (e.g. statewide)
-                station_ids = [s["station_id"] for s in stations[:20]]
-            else:
-                lat_min, lat_max, lng_min, lng_max = bounds
-                for s in stations:
-                    try:
-                        slat, slng = float(s["lat"]), float(s["lng"])
-                        if lat_min <= slat <= lat_max and lng_min <= slng <= lng_max:
-                            station_ids.append(s["station_id"])
-                    except:
-                        continue
-            
-            if not station_ids:
-                result = {"error": f"No stations found on {args.island}"}
-            else:
-                # Limit to 50 to avoid timeouts
-                station_ids = station_ids[:50]
-                
-                # 4. Fetch data
-                today = datetime.now().strftime("%Y-%m-%d")
-                measurements = await client.get_mesonet_data(
-                    station_ids=station_ids,
-                    start_date=today,
-                    end_date=today,
-                    var_ids=[args.datatype],
-                    limit=100
-                )
-                
-                vals = []
-                for m in measurements:
-                    if args.datatype in m:
-                        try:
-                            vals.append(float(m[args.datatype]))
-                        except:
-                            continue
-                
-                if not vals:
-                    result = {
-                        "island": args.island,
-                        "stations_checked": len(station_ids),
-                        "message": f"No recent data for {args.datatype} found"
-                    }
-                else:
-                    avg_val = sum(vals) / len(vals)
-                    result = {
-                        "island": args.island,
-                        "date": today,
-                        "datatype": args.datatype,
-                        "average": round(avg_val, 2),
-                        "min": min(vals),
-                        "max": max(vals),
-                        "station_count": len(vals),
-                        "note": "Averaged from active mesonet stations"
-                    }
-
-        elif name == "get_city_current_weather":
-            args = GetCityWeatherArgs(**arguments)
-            city_data = CITY_LOCATIONS.get(args.city.lower())
-            if not city_data:
-                raise ValueError(f"Unknown city: {args.city}")
-                
-            # 1. Get all stations
-            stations = await client.get_mesonet_stations()
-            
-            # 2. Find nearby stations
-            nearby_stations = []
-            for station in stations:
-                try:
-                    dist = calculate_distance(
-                        city_data["lat"], city_data["lng"],
-                        float(station["lat"]), float(station["lng"])
-                    )
-                    if dist <= 15:  # within 15km
-                        nearby_stations.append(station)
-                except (ValueError, KeyError, TypeError):
-                    continue
-            
-            if not nearby_stations:
-                result = {"error": f"No weather stations found within 15km of {args.city}"}
-            else:
-                # 3. Get data for these stations
-                station_ids = [s["station_id"] for s in nearby_stations]
-                # Use today's date
-                today = datetime.now().strftime("%Y-%m-%d")
-                
-                # Fetch data
-                measurements = await client.get_mesonet_data(
-                    station_ids=station_ids,
-                    start_date=today,
-                    end_date=today,
-                    var_ids=[args.datatype],
-                    limit=100
-                )
-                
-                # 4. Aggregation
-                vals = []
-                for m in measurements:
-                    if args.datatype in m:
-                        try:
-                            vals.append(float(m[args.datatype]))
-                        except:
-                            continue
-                            
-                if not vals:
-                    result = {
-                        "city": args.city,
-                        "stations_found": len(nearby_stations),
-                        "message": f"Found {len(nearby_stations)} stations but no recent data for {args.datatype}"
-                    }
-                else:
-                    avg_val = sum(vals) / len(vals)
-                    result = {
-                        "city": args.city,
-                        "date": today,
-                        "datatype": args.datatype,
-                        "average": round(avg_val, 2),
-                        "min": min(vals),
-                        "max": max(vals),
-                        "station_count": len(vals),
-                        "stations_used": station_ids
-                    }
-
-        elif name == "compare_current_vs_historical":
-            args = CompareHistoryArgs(**arguments)
-            # Re-use city logic to get current
-            city_data = CITY_LOCATIONS.get(args.city.lower())
-            if not city_data:
-                raise ValueError(f"Unknown city: {args.city}")
-                
-            # 1. Get Current Data (Logic similar to get_city_current_weather)
-            # Find nearby stations
-            stations = await client.get_mesonet_stations()
-            nearby_stations = []
-            for station in stations:
-                try:
-                    dist = calculate_distance(
-                        city_data["lat"], city_data["lng"],
-                        float(station["lat"]), float(station["lng"])
-                    )
-                    if dist <= 15:
-                        nearby_stations.append(station)
-                except:
-                    continue
-            
-            current_val = None
-            if nearby_stations:
-                station_ids = [s["station_id"] for s in nearby_stations]
-                today = datetime.now().strftime("%Y-%m-%d")
-                measurements = await client.get_mesonet_data(
-                    station_ids=station_ids,
-                    start_date=today,
-                    end_date=today,
-                    var_ids=[args.datatype],
-                    limit=100
-                )
-                vals = []
-                for m in measurements:
-                    if args.datatype in m:
-                        try:
-                            vals.append(float(m[args.datatype]))
-                        except:
-                            continue
-                if vals:
-                    current_val = sum(vals) / len(vals)
-
-            # 2. Get Historical Data (Timeseries for same month, previous year)
-            # We use the extent for the island the city is on
-            # And use the city coordinates
-            last_year = datetime.now().replace(year=datetime.now().year - 1)
-            start_date = last_year.replace(day=1).strftime("%Y-%m-%d")
-            # End date is end of that month
-            next_month = last_year.replace(day=28) + timedelta(days=4)
-            end_date = (next_month - timedelta(days=next_month.day)).strftime("%Y-%m-%d")
-            
-            # Timeseries params
-            ts_datatype = args.datatype
-            if args.datatype == "temperature": ts_datatype = "temp_mean"
-            if args.datatype == "precipitation": ts_datatype = "rainfall"
-            
-            historical_val = None
-            try:
-                # Use island extent code from city data
-                island_code = ISLAND_EXTENTS.get(city_data["island"], "statewide")
-                
-                # Fetch timeseries
-                ts_data = await client.get_timeseries_data(
-                    datatype=ts_datatype,
-                    start=start_date,
-                    end=end_date,
-                    lat=city_data["lat"],
-                    lng=city_data["lng"],
-                    extent=island_code,
-                    production="new" if ts_datatype == "rainfall" else None,
-                    aggregation="month" if ts_datatype != "rainfall" else None,
-                    period="month" if ts_datatype == "rainfall" else None
-                )
-                
-                if ts_data and len(ts_data) > 0:
-                    # Average the monthly values (should be just 1 for a month, but handle list)
-                    ts_vals = list(ts_data.values())
-                    historical_val = sum(ts_vals) / len(ts_vals)
-            except Exception as e:
-                print(f"Historical fetch failed: {e}")
-                
-            # 3. Compare
+
+# Shared API client so tool calls reuse its pooled keep-alive connections
+_client: Optional[HCDPClient] = None
+
+
+def get_client() -> HCDPClient:
+    """Return the process-wide HCDP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = HCDPClient()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client's connection pool, if one was created."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
+
+
+# Validators for each tool's arguments, built once and reused on every call
+ARG_ADAPTERS = {
+    "get_timeseries_data": TypeAdapter(GetTimeseriesArgs),
+    "get_station_data": TypeAdapter(GetStationDataArgs),
+    "get_mesonet_data": TypeAdapter(GetMesonetDataArgs),
+    "get_mesonet_stations": TypeAdapter(GetMesonetStationsArgs),
+    "get_mesonet_variables": TypeAdapter(GetMesonetVariablesArgs),
+    "get_island_current_summary": TypeAdapter(GetIslandSummaryArgs),
+    "get_city_current_weather": TypeAdapter(GetCityWeatherArgs),
+    "compare_current_vs_historical": TypeAdapter(CompareHistoryArgs),
+    "get_island_history_summary": TypeAdapter(GetIslandHistoryArgs)
+}
+
+
+def _passthrough(method):
+    """Handler forwarding validated arguments to the same-named client method.
+
+    The argument dataclasses mirror the client signatures, so their slot
+    names replace spelling out every field; unset options keep client
+    defaults.
+    """
+    async def handler(args, client):
+        kwargs = {}
+        for field in args.__slots__:
+            value = getattr(args, field)
+            if value is not None:
+                kwargs[field] = value
+        return await getattr(client, method)(**kwargs)
+    return handler
+
+
+# async def _handle_get_climate_raster(args, client):
+#     return await client.get_raster_data(
+#         datatype=args.datatype,
+#         date=args.date,
+#         extent=args.extent,
+#         location=args.location,
+#         production=args.production,
+#         aggregation=args.aggregation,
+#         timescale=args.timescale,
+#         period=args.period
+#     )
+
+
+# async def _handle_generate_data_package_email(args, client):
+#     return await client.generate_data_package_email(
+#         email=args.email,
+#         datatype=args.datatype,
+#         production=args.production,
+#         period=args.period,
+#         extent=args.extent,
+#         start_date=args.start_date,
+#         end_date=args.end_date,
+#         files=args.files,
+#         zipName=args.zipName
+#     )
+
+
+# async def _handle_generate_data_package_instant_link(args, client):
+#     return await client.generate_data_package_instant_link(
+#         email=args.email,
+#         datatype=args.datatype,
+#         production=args.production,
+#         period=args.period,
+#         extent=args.extent,
+#         start_date=args.start_date,
+#         end_date=args.end_date,
+#         zipName=args.zipName
+#     )
+
+
+# async def _handle_generate_data_package_instant_content(args, client):
+#     return await client.generate_data_package_instant_content(
+#         email=args.email,
+#         datatype=args.datatype,
+#         production=args.production,
+#         period=args.period,
+#         extent=args.extent,
+#         start_date=args.start_date,
+#         end_date=args.end_date,
+#         zipName=args.zipName
+#     )
+
+
+# async def _handle_generate_data_package_splitlink(args, client):
+#     return await client.generate_data_package_splitlink(
+#         email=args.email,
+#         datatype=args.datatype,
+#         production=args.production,
+#         period=args.period,
+#         extent=args.extent,
+#         start_date=args.start_date,
+#         end_date=args.end_date,
+#         zipName=args.zipName
+#     )
+
+
+# async def _handle_list_production_files(args, client):
+#     return await client.list_production_files(
+#         datatype=args.datatype,
+#         production=args.production,
+#         period=args.period,
+#         extent=args.extent
+#     )
+
+
+# async def _handle_retrieve_production_file(args, client):
+#     return await client.retrieve_production_file(
+#         file_path=args.file_path
+#     )
+
+
+# async def _handle_get_mesonet_station_monitor(args, client):
+#     return await client.get_mesonet_station_monitor(
+#         location=args.location
+#     )
+
+
+# async def _handle_email_mesonet_measurements(args, client):
+#     return await client.email_mesonet_measurements(
+#         email=args.email,
+#         location=args.location,
+#         station_ids=args.station_ids,
+#         start_date=args.start_date,
+#         end_date=args.end_date,
+#         var_ids=args.var_ids,
+#         intervals=args.intervals
+#     )
+
+
+async def _handle_get_island_current_summary(args, client):
+    """Summarize today's readings across an island's stations."""
+    # 1. Get all stations
+    stations = await client.get_mesonet_stations()
+    if "error" in stations:
+        raise ValueError(f"Failed to fetch stations: {stations['error']}")
+
+    # 2. Filter by island
+    target_island = args.island.lower()
+    if target_island not in ISLAND_EXTENTS:
+        raise ValueError(f"Unknown island: {target_island}")
+
+    # 3. Get list of station IDs from the lat/lng bounding box
+    if target_island not in ISLAND_BOUNDS:
+        # Fallback: Just take first 20 stations if bounds unknown (e.g. statewide)
+        station_ids = [s["station_id"] for s in stations[:20]]
+    else:
+        # Station-to-island lists are built once per station roster
+        station_ids = station_index(stations).ids_by_bounds(ISLAND_BOUNDS)[target_island]
+
+    if not station_ids:
+        result = {"error": f"No stations found on {args.island}"}
+    else:
+        # Limit to 50 to avoid timeouts
+        station_ids = station_ids[:50]
+
+        # 4. Fetch data
+        today = today_str()
+        measurements = await fetch_station_measurements(
+            client, station_ids, args.datatype, today
+        )
+
+        vals = measurement_values(measurements, args.datatype)
+
+        if not vals.size:
             result = {
-                "city": args.city,
-                "datatype": args.datatype,
-                "current_value": round(current_val, 2) if current_val is not None else "No data",
-                "historical_avg": round(historical_val, 2) if historical_val is not None else "No data",
-                "historical_period": f"{start_date} to {end_date}",
-                "comparison": "N/A"
+                "island": args.island,
+                "stations_checked": len(station_ids),
+                "message": f"No recent data for {args.datatype} found"
             }
-            
-            if current_val is not None and historical_val is not None:
-                diff = current_val - historical_val
-                sign = "+" if diff > 0 else ""
-                result["comparison"] = f"{sign}{diff:.2f} difference from historical average"
-                result["details"] = f"Current ({round(current_val, 1)}) is {'higher' if diff > 0 else 'lower'} than historical ({round(historical_val, 1)})"
-
-        elif name == "get_island_history_summary":
-            args = GetIslandHistoryArgs(**arguments)
-            target_island = args.island.lower()
-            points = ISLAND_REPRESENTATIVE_POINTS.get(target_island)
-            
-            if not points:
-                raise ValueError(f"Unknown island or no representative points for: {args.island}")
-            
-            # Prepare arguments for parallel fetching
-            ts_datatype = args.datatype
-            production = "new" if ts_datatype == "rainfall" else None
-            aggregation = "month" if ts_datatype != "rainfall" else None
-            period = "month" if ts_datatype == "rainfall" else None
-            if ts_datatype == "temperature": ts_datatype = "temp_mean"
-            if ts_datatype == "precipitation": ts_datatype = "rainfall"
-
-            start_date = f"{args.year}-01-01"
-            end_date = f"{args.year}-12-31"
-            island_code = ISLAND_EXTENTS.get(target_island, "statewide")
-
-            # Create tasks (Parallel Fetching!)
-            tasks = []
-            location_names = []
-            
-            for loc_name, coords in points.items():
-                location_names.append(loc_name)
-                tasks.append(client.get_timeseries_data(
-                    datatype=ts_datatype,
-                    start=start_date,
-                    end=end_date,
-                    lat=coords["lat"],
-                    lng=coords["lng"],
-                    extent=island_code,
-                    production=production,
-                    aggregation=aggregation,
-                    period=period
-                ))
-            
-            # Execute all tasks in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            point_summaries = []
-            all_vals = []
-            
-            for i, res in enumerate(results):
-                loc_name = location_names[i]
-                if isinstance(res, Exception):
-                    point_summaries.append({
-                        "location": loc_name, 
-                        "error": str(res)
-                    })
-                    continue
-                
-                if res and isinstance(res, dict) and len(res) > 0:
-                    try:
-                        vals = list(res.values())
-                        valid_vals = [v for v in vals if v is not None and v != -9999]
-                        if valid_vals:
-                            avg = sum(valid_vals) / len(valid_vals)
-                            point_summaries.append({
-                                "location": loc_name,
-                                "average": round(avg, 2),
-                                "min": min(valid_vals),
-                                "max": max(valid_vals),
-                                "data_points": len(valid_vals)
-                            })
-                            all_vals.extend(valid_vals)
-                        else:
-                            point_summaries.append({"location": loc_name, "message": "No valid data"})
-                    except Exception as e:
-                        point_summaries.append({"location": loc_name, "error": str(e)})
-                else:
-                    point_summaries.append({"location": loc_name, "message": "No data returned"})
-
-            # Island-wide aggregation
-            island_avg = None
-            if all_vals:
-                island_avg = sum(all_vals) / len(all_vals)
-                
+        else:
+            avg_val = float(vals.mean())
             result = {
                 "island": args.island,
-                "year": args.year,
+                "date": today,
                 "datatype": args.datatype,
-                "island_wide_average": round(island_avg, 2) if island_avg else "N/A",
-                "regional_breakdown": point_summaries
+                "average": round(avg_val, 2),
+                "min": float(vals.min()),
+                "max": float(vals.max()),
+                "station_count": int(vals.size),
+                "note": "Averaged from active mesonet stations"
             }
-            
+    return result
+
+
+async def city_readings(client, city_data, datatype, date):
+    """Stations within 15km of a city and their numeric readings on date."""
+    # 1. Get all stations
+    stations = await client.get_mesonet_stations()
+
+    # 2. Find nearby stations (within 15km)
+    station_ids = station_index(stations).ids_within_radius(
+        city_data["lat"], city_data["lng"], 15
+    )
+    if not station_ids:
+        return station_ids, np.empty(0)
+
+    # 3. Fetch data for these stations
+    measurements = await fetch_station_measurements(
+        client, station_ids, datatype, date
+    )
+    return station_ids, measurement_values(measurements, datatype)
+
+
+async def _handle_get_city_current_weather(args, client):
+    """Summarize today's readings from stations near a city."""
+    city_data = CITY_LOCATIONS.get(args.city)
+    if not city_data:
+        raise ValueError(f"Unknown city: {args.city}")
+
+    today = today_str()
+    station_ids, vals = await city_readings(client, city_data, args.datatype, today)
+
+    # 4. Aggregation
+    if not station_ids:
+        result = {"error": f"No weather stations found within 15km of {args.city}"}
+    elif not vals.size:
+        result = {
+            "city": args.city,
+            "stations_found": len(station_ids),
+            "message": f"Found {len(station_ids)} stations but no recent data for {args.datatype}"
+        }
+    else:
+        avg_val = float(vals.mean())
+        result = {
+            "city": args.city,
+            "date": today,
+            "datatype": args.datatype,
+            "average": round(avg_val, 2),
+            "min": float(vals.min()),
+            "max": float(vals.max()),
+            "station_count": int(vals.size),
+            "stations_used": station_ids
+        }
+    return result
+
+
+def last_year_month_range(now=None):
+    """First and last day of the current month one year ago, as YYYY-MM-DD."""
+    # Read the clock once; Feb 29 needs no special case since only the
+    # month carries over to last year
+    now = now or datetime.now()
+    year, month = now.year - 1, now.month
+    last_day = calendar.monthrange(year, month)[1]
+    return f"{year}-{month:02d}-01", f"{year}-{month:02d}-{last_day:02d}"
+
+
+async def _current_for_city(client, city_data, datatype):
+    """Average of today's readings from stations within 15km of a city."""
+    _, vals = await city_readings(client, city_data, datatype, today_str())
+    return float(vals.mean()) if vals.size else None
+
+
+async def _historical_for_city(client, city_data, datatype, start_date, end_date):
+    """Average gridded timeseries value at a city's coordinates over a date range."""
+    # Timeseries params
+    ts_datatype, production, aggregation, period = timeseries_params(datatype)
+
+    # Use island extent code from city data
+    island_code = ISLAND_EXTENTS.get(city_data["island"], "statewide")
+
+    # Fetch timeseries
+    ts_data = await client.get_timeseries_data(
+        datatype=ts_datatype,
+        start=start_date,
+        end=end_date,
+        lat=city_data["lat"],
+        lng=city_data["lng"],
+        extent=island_code,
+        production=production,
+        aggregation=aggregation,
+        period=period
+    )
+
+    if ts_data and len(ts_data) > 0:
+        # Average the monthly values (should be just 1 for a month, but handle list)
+        ts_vals = valid_values(ts_data.values())
+        if ts_vals.size:
+            return float(ts_vals.mean())
+    return None
+
+
+async def _handle_compare_current_vs_historical(args, client):
+    """Compare a city's current reading with last year's monthly value."""
+    # Re-use city logic to get current
+    city_data = CITY_LOCATIONS.get(args.city)
+    if not city_data:
+        raise ValueError(f"Unknown city: {args.city}")
+
+    # Historical window: same month, previous year
+    start_date, end_date = last_year_month_range()
+
+    # 1-2. Current and historical paths are independent, so fetch both at once
+    current_val, historical_val = await asyncio.gather(
+        _current_for_city(client, city_data, args.datatype),
+        _historical_for_city(client, city_data, args.datatype, start_date, end_date),
+        return_exceptions=True
+    )
+    if isinstance(current_val, Exception):
+        raise current_val
+    if isinstance(historical_val, Exception):
+        print(f"Historical fetch failed: {historical_val}")
+        historical_val = None
+
+    # 3. Compare
+    result = {
+        "city": args.city,
+        "datatype": args.datatype,
+        "current_value": round(current_val, 2) if current_val is not None else "No data",
+        "historical_avg": round(historical_val, 2) if historical_val is not None else "No data",
+        "historical_period": f"{start_date} to {end_date}",
+        "comparison": "N/A"
+    }
+
+    if current_val is not None and historical_val is not None:
+        diff = current_val - historical_val
+        sign = "+" if diff > 0 else ""
+        result["comparison"] = f"{sign}{diff:.2f} difference from historical average"
+        result["details"] = f"Current ({round(current_val, 1)}) is {'higher' if diff > 0 else 'lower'} than historical ({round(historical_val, 1)})"
+    return result
+
+
+async def _handle_get_island_history_summary(args, client):
+    """Summarize a year of data at an island's representative points."""
+    target_island = args.island.lower()
+    points = ISLAND_POINT_SETS.get(target_island)
+
+    if not points:
+        raise ValueError(f"Unknown island or no representative points for: {args.island}")
+
+    # Prepare arguments for parallel fetching
+    ts_datatype, production, aggregation, period = timeseries_params(args.datatype)
+
+    start_date = f"{args.year}-01-01"
+    end_date = f"{args.year}-12-31"
+    island_code = ISLAND_EXTENTS.get(target_island, "statewide")
+
+    # Create tasks (Parallel Fetching!) straight from the coordinate columns
+    location_names = points.names
+    tasks = [
+        client.get_timeseries_data(
+            datatype=ts_datatype,
+            start=start_date,
+            end=end_date,
+            lat=lat,
+            lng=lng,
+            extent=island_code,
+            production=production,
+            aggregation=aggregation,
+            period=period
+        )
+        for lat, lng in zip(points.lat.tolist(), points.lng.tolist())
+    ]
+
+    # Execute tasks in parallel, capped to stay within API rate limits
+    results = await gather_limited(tasks, return_exceptions=True)
+
+    # Process results
+    point_summaries = []
+    island_total = 0.0
+    island_count = 0
+
+    for i, res in enumerate(results):
+        loc_name = location_names[i]
+        if isinstance(res, Exception):
+            point_summaries.append({
+                "location": loc_name, 
+                "error": str(res)
+            })
+            continue
+
+        if res and isinstance(res, dict) and len(res) > 0:
+            vals = valid_values(res.values())
+            if vals.size:
+                # One sum serves both the point average and the island total
+                total = float(vals.sum())
+                point_summaries.append({
+                    "location": loc_name,
+                    "average": round(total / vals.size, 2),
+                    "min": float(vals.min()),
+                    "max": float(vals.max()),
+                    "data_points": int(vals.size)
+                })
+                island_total += total
+                island_count += int(vals.size)
+            else:
+                point_summaries.append({"location": loc_name, "message": "No valid data"})
         else:
+            point_summaries.append({"location": loc_name, "message": "No data returned"})
+
+    # Island-wide aggregation
+    island_avg = None
+    if island_count:
+        island_avg = island_total / island_count
+
+    result = {
+        "island": args.island,
+        "year": args.year,
+        "datatype": args.datatype,
+        "island_wide_average": round(island_avg, 2) if island_avg else "N/A",
+        "regional_breakdown": point_summaries
+    }
+    return result
+
+
+# Tool name -> handler coroutine
+TOOL_HANDLERS = {
+    "get_timeseries_data": _passthrough("get_timeseries_data"),
+    "get_station_data": _passthrough("get_station_data"),
+    "get_mesonet_data": _passthrough("get_mesonet_data"),
+    "get_mesonet_stations": _passthrough("get_mesonet_stations"),
+    "get_mesonet_variables": _passthrough("get_mesonet_variables"),
+    "get_island_current_summary": _handle_get_island_current_summary,
+    "get_city_current_weather": _handle_get_city_current_weather,
+    "compare_current_vs_historical": _handle_compare_current_vs_historical,
+    "get_island_history_summary": _handle_get_island_history_summary
+}
+
+# Tool name -> (argument validator, handler), so each call needs one lookup
+TOOL_DISPATCH = {
+    name: (ARG_ADAPTERS[name].validate_python, handler)
+    for name, handler in TOOL_HANDLERS.items()
+}
+
+
+# Leading bytes of the binary formats the API serves
+MAGIC_MEDIA_TYPES = (
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+# Image types MCP clients can display inline; others travel as resources
+INLINE_IMAGE_TYPES = frozenset({"image/png", "image/jpeg", "image/gif", "image/webp"})
+
+
+def guess_media_type(name: str, arguments: dict, data: bytes) -> str:
+    """Media type of a binary payload from its magic bytes, else the tool call."""
+    for magic, media_type in MAGIC_MEDIA_TYPES:
+        if data.startswith(magic):
+            return media_type
+    # Try to guess specific type based on tool name
+    if "raster" in name:
+        return "image/tiff"
+    if "zip" in str(arguments.get("zipName", "")):
+        return "application/zip"
+    return "application/octet-stream"  # Generic binary
+
+
+def binary_result(
+    name: str, arguments: dict, result: dict
+) -> List[TextContent | ImageContent | EmbeddedResource]:
+    """Return binary tool output as native MCP content plus a JSON metadata block.
+
+    The payload is base64-encoded once, as MCP requires, instead of being
+    embedded in the pretty-printed JSON text where it would also be escaped
+    and indented. Displayable images go out as ImageContent; anything else
+    (GeoTIFF, zip) as an embedded blob resource.
+    """
+    data = result["data"]
+    media_type = guess_media_type(name, arguments, data)
+    encoded = serialization.b64encode(data)
+
+    metadata = {key: value for key, value in result.items() if key != "data"}
+    metadata.update(media_type=media_type, size_bytes=len(data))
+    if media_type in INLINE_IMAGE_TYPES:
+        content = ImageContent(type="image", mimeType=media_type, data=encoded)
+    else:
+        content = EmbeddedResource(
+            type="resource",
+            resource=BlobResourceContents(
+                uri=f"hcdp://{name}",
+                mimeType=media_type,
+                blob=encoded,
+            ),
+        )
+    return [TextContent(type="text", text=serialization.dumps_pretty(metadata)), content]
+
+
+async def handle_list_tools() -> list[Tool]:
+    """List available tools."""
+    return TOOLS
+
+
+# Built once; handing the SDK a finished result saves it wrapping and
+# re-validating the tool list on every tools/list request
+LIST_TOOLS_RESULT = ListToolsResult(tools=TOOLS)
+
+
+@app.list_tools()
+async def handle_list_tools_request(request: ListToolsRequest) -> ListToolsResult:
+    """Answer tools/list with the prebuilt result."""
+    return LIST_TOOLS_RESULT
+
+
+# Arguments are validated (and coerced) by the pydantic models in
+# TOOL_DISPATCH; the SDK's extra jsonschema pass costs milliseconds per call
+@app.call_tool(validate_input=False)
+async def handle_call_tool(name: str, arguments: dict) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Handle tool calls."""
+    client = get_client()
+    
+    try:
+        entry = TOOL_DISPATCH.get(name)
+        if entry is None:
             raise ValueError(f"Unknown tool: {name}")
-            
-        # Process the result to handle binary data
-        processed_result = result
-        if isinstance(result, dict) and "data" in result:
-             data_content = result["data"]
-             # Check if it's bytes
-             if isinstance(data_content, bytes):
-                 # Base64 encode binary data
-                 processed_result["data"] = base64.b64encode(data_content).decode('utf-8')
-                 processed_result["encoding"] = "base64"
-                 processed_result["media_type"] = "application/octet-stream"  # Generic binary
-                 
-                 # Try to guess specific type based on tool name
-                 if "raster" in name:
-                     processed_result["media_type"] = "image/tiff"
-                 elif "zip" in str(arguments.get("zipName", "")):
-                     processed_result["media_type"] = "application/zip"
+        validate, handler = entry
+        result = await handler(validate(arguments), client)
+
+        if isinstance(result, dict) and isinstance(result.get("data"), bytes):
+            return binary_result(name, arguments, result)
 
         return [TextContent(
             type="text",
-            text=json.dumps(processed_result, indent=2, default=str)
+            text=serialization.dumps_pretty(result)
         )]
         
     except Exception as e:
@@ -933,24 +1116,34 @@ async def handle_call_tool(name: str, arguments: dict) -> Sequence[TextContent |
 
 async def main():
     """Main entry point for the server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="hcdp-mcp-server",
-                server_version="0.1.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={}
+    # Compile the JIT kernel off the event loop before serving any request
+    await asyncio.to_thread(warm_up_jit)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="hcdp-mcp-server",
+                    server_version="0.1.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={}
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await close_client()
 
 
 def cli_main():
     """Entry point for the CLI script."""
-    asyncio.run(main())
+    configure()
+    if uvloop is not None:
+        # libuv-backed loop; stdio and httpx I/O run unchanged on top of it
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
 
 if __name__ == "__main__":
@@ -1,25 +1,100 @@
-"""Pytest configuration and shared fixtures for HCDP MCP Server tests."""
+"""Pytest configuration and shared fixtures for HCDP MCP Server tests.
+
+Sample data fixtures are built once per session and handed out read-only
+(tuples and top-level mapping proxies) so tests can't alter each other's data.
+"""
 
 import pytest
-import os
+import pytest_asyncio
+from types import MappingProxyType
 from unittest.mock import patch
 
+from hcdp_mcp_server import server
+from hcdp_mcp_server.client import HCDPClient
+from hcdp_mcp_server.geo import clear_station_index
+
+
+# Module-level so tests can also parametrize over them at collection time
+VALID_VARIABLES = (
+    "rainfall",
+    "temp_mean",
+    "temp_min",
+    "temp_max",
+    "relative_humidity",
+    "spi",
+    "ndvi_modis",
+    "ignition_probability",
+)
+VALID_LOCATIONS = ("hawaii", "american_samoa")
+VALID_AGGREGATIONS = ("day", "month", "year")
+VALID_FORMATS = ("tiff", "json", "csv")
+
+
+@pytest.fixture(autouse=True)
+def fresh_station_index():
+    """Keep cached station indexes from leaking between tests."""
+    clear_station_index()
+    yield
+    clear_station_index()
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_client():
+    """Drop the server's shared client so each test's HCDPClient patch applies."""
+    server._client = None
+    yield
+    server._client = None
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def hcdp_client():
+    """One client, and so one connection pool, shared across the session.
+
+    Created and closed on the session event loop; async tests that use it
+    must run there too, via @pytest.mark.asyncio(loop_scope="session").
+    """
+    client = HCDPClient(api_token="test")
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def client(hcdp_client):
+    """The shared client with its response caches emptied for this test."""
+    hcdp_client.clear_cache()
+    return hcdp_client
+
+
+@pytest.fixture(scope="class")
+def httpx_get_patch():
+    """Patch httpx.AsyncClient.get once for every test in the requesting class."""
+    with patch("httpx.AsyncClient.get") as mock_get:
+        yield mock_get
+
+
+@pytest.fixture
+def mock_get(httpx_get_patch):
+    """The class's httpx get mock, reset so no calls or canned responses carry over."""
+    httpx_get_patch.reset_mock(return_value=True, side_effect=True)
+    return httpx_get_patch
+
 
 @pytest.fixture
-def mock_env_vars():
+def mock_env_vars(monkeypatch):
     """Mock environment variables for testing."""
     env_vars = {
         "HCDP_API_TOKEN": "test_api_token",
         "HCDP_BASE_URL": "https://test.api.hcdp.com"
     }
-    with patch.dict(os.environ, env_vars):
-        yield env_vars
+    for name, value in env_vars.items():
+        monkeypatch.setenv(name, value)
+    return env_vars
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_raster_response():
     """Sample response for raster data endpoint."""
-    return {
+    return MappingProxyType({
         "status": "success",
         "data": {
             "url": "https://example.com/raster.tiff",
@@ -35,13 +110,13 @@ def sample_raster_response():
             "grid_resolution": "250m",
             "projection": "EPSG:4326"
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_timeseries_response():
     """Sample response for timeseries data endpoint."""
-    return {
+    return MappingProxyType({
         "data": [
             {"date": "2023-01-01", "value": 125.5, "unit": "mm"},
             {"date": "2023-02-01", "value": 98.2, "unit": "mm"},
@@ -57,13 +132,13 @@ def sample_timeseries_response():
             "aggregation": "month",
             "location": "hawaii"
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_station_response():
     """Sample response for station data endpoint."""
-    return {
+    return MappingProxyType({
         "stations": [
             {
                 "id": "STAT001",
@@ -96,13 +171,13 @@ def sample_station_response():
             "location": "hawaii",
             "total_stations": 2
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_mesonet_response():
     """Sample response for mesonet data endpoint."""
-    return {
+    return MappingProxyType({
         "measurements": [
             {
                 "timestamp": "2023-01-01T00:00:00Z",
@@ -136,13 +211,13 @@ def sample_mesonet_response():
             "location": "hawaii",
             "total_measurements": 24
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_data_package_response():
     """Sample response for data package generation endpoint."""
-    return {
+    return MappingProxyType({
         "package_id": "pkg_abc123",
         "status": "processing",
         "estimated_completion": "2023-01-01T12:00:00Z",
@@ -155,70 +230,61 @@ def sample_data_package_response():
             "rainfall_2023_03_hawaii_month.tiff",
             "metadata.json"
         ]
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_variables():
     """List of valid climate variables supported by HCDP API."""
-    return [
-        "rainfall",
-        "temp_mean", 
-        "temp_min",
-        "temp_max",
-        "relative_humidity",
-        "spi",
-        "ndvi_modis",
-        "ignition_probability"
-    ]
+    return VALID_VARIABLES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_locations():
     """List of valid locations supported by HCDP API."""
-    return ["hawaii", "american_samoa"]
+    return VALID_LOCATIONS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_aggregations():
     """List of valid temporal aggregations supported by HCDP API."""
-    return ["day", "month", "year"]
+    return VALID_AGGREGATIONS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_formats():
     """List of valid output formats supported by HCDP API."""
-    return ["tiff", "json", "csv"]
+    return VALID_FORMATS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def hawaii_coordinates():
     """Sample coordinates within Hawaii bounds."""
-    return [
+    return (
         (21.3099, -157.8581),  # Honolulu
         (20.7097, -156.2533),  # Haleakala
         (19.7297, -155.0900),  # Hilo
         (21.9743, -159.3650),  # Lihue, Kauai
         (20.8893, -156.6906),  # Kahului, Maui
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def american_samoa_coordinates():
     """Sample coordinates within American Samoa bounds."""
-    return [
+    return (
         (-14.3064, -170.6944),  # Pago Pago
         (-14.2846, -170.7365),  # Leone
         (-14.2393, -170.6348),  # Fagatogo
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_date_ranges():
     """Sample date ranges for testing."""
-    return [
+    return (
         ("2023-01-01", "2023-01-31"),  # Single month
         ("2023-01-01", "2023-12-31"),  # Full year
         ("2022-06-01", "2023-05-31"),  # Multi-year span
         ("2023-07-15", "2023-07-15"),  # Single day
-    ]
\ No newline at end of file
+    )
\ No newline at end of file
@@ -26,12 +26,14 @@ async def download_december_2024():
     # Try both extents
     extents = ["bi", "statewide"]
     
-    for extent in extents:
-        print(f"\n--- Testing extent: {extent} ---")
-        for config in test_configs:
+    # Each probe is an independent round trip, so run them concurrently
+    # (at most 8 in flight) and print each probe's log once it finishes
+    semaphore = asyncio.Semaphore(8)
+    
+    async def probe(extent, config):
+        lines = [f"Trying date={config['date']}, production={config['production']}"]
+        async with semaphore:
             try:
-                print(f"Trying date={config['date']}, production={config['production']}")
-                
                 params = {
                     "datatype": "rainfall",
                     "date": config["date"],
@@ -48,7 +50,7 @@ async def download_december_2024():
                     filename = f"sample_data/rainfall_{config['date']}_{extent}_{config['production'] or 'default'}.tiff"
                     with open(filename, 'wb') as f:
                         f.write(raster_data)
-                    print(f"✓ SUCCESS! Saved: {filename} ({len(raster_data):,} bytes)")
+                    lines.append(f"✓ SUCCESS! Saved: {filename} ({len(raster_data):,} bytes)")
                     
                     # Try to get temperature data with the same successful parameters
                     try:
@@ -64,15 +66,25 @@ async def download_december_2024():
                             temp_filename = f"sample_data/temp_mean_{config['date']}_{extent}_{config['production'] or 'default'}.tiff"
                             with open(temp_filename, 'wb') as f:
                                 f.write(temp_data)
-                            print(f"✓ BONUS! Temperature data: {temp_filename} ({len(temp_data):,} bytes)")
+                            lines.append(f"✓ BONUS! Temperature data: {temp_filename} ({len(temp_data):,} bytes)")
                     except Exception as te:
-                        print(f"  Temperature failed: {str(te)[:80]}...")
+                        lines.append(f"  Temperature failed: {type(te).__name__}: {te.args[0] if te.args else ''}")
                     
                 else:
-                    print("  No data in response")
+                    lines.append("  No data in response")
                     
             except Exception as e:
-                print(f"  ✗ Failed: {str(e)[:80]}...")
+                lines.append(f"  ✗ Failed: {type(e).__name__}: {e.args[0] if e.args else ''}")
+        return lines
+    
+    results = await asyncio.gather(*(
+        probe(extent, config) for extent in extents for config in test_configs
+    ))
+    
+    for i, extent in enumerate(extents):
+        print(f"\n--- Testing extent: {extent} ---")
+        for lines in results[i * len(test_configs):(i + 1) * len(test_configs)]:
+            print("\n".join(lines))
 
 if __name__ == "__main__":
     asyncio.run(download_december_2024())
\ No newline at end of file
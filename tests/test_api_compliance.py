@@ -1,32 +1,63 @@
 """Tests for HCDP API compliance and specification adherence."""
 
 import pytest
+from dataclasses import replace
 from datetime import datetime
 from typing import Dict, Any
+from pydantic import ValidationError
 
 from hcdp_mcp_server.client import HCDPClient
 from hcdp_mcp_server.server import (
     GetClimateRasterArgs,
-    GetTimeseriesArgs, 
+    GetTimeseriesArgs,
     GetStationDataArgs,
     GetMesonetDataArgs,
-    GenerateDataPackageArgs
+    GenerateDataPackageEmailArgs
 )
 
+from .conftest import VALID_AGGREGATIONS, VALID_LOCATIONS
+
+
+# Expected values of the optional arguments when only required ones are given
+_RASTER_DEFAULTS = {"location": "hawaii", "production": None, "aggregation": None, "timescale": None, "period": None}
+_TS_DEFAULTS = {"lat": None, "lng": None, **_RASTER_DEFAULTS}
+
+
+def _shared(args):
+    """Hand one args object to every test in a scope, then check none mutated it."""
+    snapshot = replace(args)
+    yield args
+    assert args == snapshot, f"a test mutated the shared {type(args).__name__}"
+
+
+@pytest.fixture(scope="module")
+def raster_minimal_args():
+    """Raster args with only the required parameters, built once per module."""
+    yield from _shared(GetClimateRasterArgs(
+        datatype="rainfall",
+        date="2023-01",
+        extent="statewide"
+    ))
+
+
+@pytest.fixture(scope="module")
+def ts_minimal_args():
+    """Timeseries args with only the required parameters, built once per module."""
+    yield from _shared(GetTimeseriesArgs(
+        datatype="rainfall",
+        start="2023-01-01",
+        end="2023-12-31",
+        extent="oa"
+    ))
+
 
 class TestAPISpecificationCompliance:
     """Test compliance with official HCDP API specification."""
     
-    def test_base_url_compliance(self):
+    def test_base_url_compliance(self, hcdp_client):
         """Test that base URL matches specification."""
-        # According to the API spec, the base URL should be api.hcdp.ikewai.org
-        # But the implementation uses ikeauth.its.hawaii.edu/files/v2/download/public
-        client = HCDPClient(api_token="test")
-        expected_base = "https://ikeauth.its.hawaii.edu/files/v2/download/public"
-        assert client.base_url == expected_base
-        
-        # Note: This may need updating to match the official API spec
-        # which suggests: https://api.hcdp.ikewai.org
+        # The API spec's host, used unless HCDP_BASE_URL overrides it
+        assert hcdp_client.base_url == "https://api.hcdp.ikewai.org"
 
     def test_authentication_header_format(self):
         """Test that authentication header follows Bearer token format."""
@@ -34,414 +65,352 @@ class TestAPISpecificationCompliance:
         assert client.headers["Authorization"] == "Bearer test_token"
         assert client.headers["Content-Type"] == "application/json"
 
-    def test_supported_variables_coverage(self, valid_variables):
+    @pytest.mark.parametrize("datatype", ["rainfall", "temp_mean", "temp_min", "temp_max", "rh"])
+    def test_supported_variables_coverage(self, datatype):
         """Test that common climate variables are supported."""
-        # The implementation should support key climate variables
-        test_args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01", 
-            end="2023-12-31"
+        args = GetClimateRasterArgs(
+            datatype=datatype,
+            date="2023-01",
+            extent="statewide"
         )
-        assert test_args.var == "rainfall"
-        
-        # Test other common variables
-        for var in ["temp_mean", "temp_min", "temp_max", "relative_humidity"]:
-            args = GetClimateRasterArgs(
-                var=var,
-                start="2023-01-01",
-                end="2023-12-31"
-            )
-            assert args.var == var
-
-    def test_supported_locations(self, valid_locations):
+        assert args.datatype == datatype
+
+    @pytest.mark.parametrize("location", VALID_LOCATIONS)
+    def test_supported_locations(self, location):
         """Test that both Hawaii and American Samoa are supported."""
-        for location in valid_locations:
-            args = GetClimateRasterArgs(
-                var="rainfall",
-                start="2023-01-01",
-                end="2023-12-31",
-                location=location
-            )
-            assert args.location == location
-
-    def test_supported_aggregations(self, valid_aggregations):
+        args = GetClimateRasterArgs(
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide",
+            location=location
+        )
+        assert args.location == location
+
+    @pytest.mark.parametrize("aggregation", VALID_AGGREGATIONS)
+    def test_supported_aggregations(self, aggregation):
         """Test that all temporal aggregations are supported."""
-        for aggregation in valid_aggregations:
-            args = GetClimateRasterArgs(
-                var="rainfall",
-                start="2023-01-01",
-                end="2023-12-31", 
-                aggregation=aggregation
-            )
-            assert args.aggregation == aggregation
-
-    def test_supported_formats(self, valid_formats):
-        """Test that all output formats are supported."""
-        for fmt in valid_formats:
-            args = GetClimateRasterArgs(
-                var="rainfall",
-                start="2023-01-01",
-                end="2023-12-31",
-                fmt=fmt
-            )
-            assert args.fmt == fmt
+        args = GetClimateRasterArgs(
+            datatype="temp_mean",
+            date="2023-01",
+            extent="statewide",
+            aggregation=aggregation
+        )
+        assert args.aggregation == aggregation
+
+    @pytest.mark.parametrize("production", ["new", "final"])
+    def test_supported_productions(self, production):
+        """Test that both rainfall production levels are supported."""
+        args = GetClimateRasterArgs(
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide",
+            production=production
+        )
+        assert args.production == production
 
 
 class TestEndpointURLCompliance:
     """Test that endpoint URLs match the API specification."""
     
-    def test_raster_endpoint_url(self):
+    def test_raster_endpoint_url(self, hcdp_client):
         """Test raster endpoint URL construction."""
-        client = HCDPClient(api_token="test")
-        # Based on implementation, should construct:
-        # https://ikeauth.its.hawaii.edu/files/v2/download/public/raster
-        expected_base = client.base_url
-        raster_url = f"{expected_base}/raster"
-        
-        # Verify this matches what the client constructs
-        assert raster_url == f"{client.base_url}/raster"
+        # Endpoint URLs are built once in HCDPClient.__init__, e.g.
+        # https://api.hcdp.ikewai.org/raster
+        assert hcdp_client._url_raster == f"{hcdp_client.base_url}/raster"
 
-    def test_timeseries_endpoint_url(self):
+    def test_timeseries_endpoint_url(self, hcdp_client):
         """Test timeseries endpoint URL construction.""" 
-        client = HCDPClient(api_token="test")
-        timeseries_url = f"{client.base_url}/raster/timeseries"
-        
-        # Should be: base_url + "/raster/timeseries"
-        expected = f"{client.base_url}/raster/timeseries"
-        assert timeseries_url == expected
+        assert hcdp_client._url_timeseries == f"{hcdp_client.base_url}/raster/timeseries"
 
-    def test_stations_endpoint_url(self):
+    def test_stations_endpoint_url(self, hcdp_client):
         """Test stations endpoint URL construction."""
-        client = HCDPClient(api_token="test")
-        stations_url = f"{client.base_url}/stations"
-        
-        expected = f"{client.base_url}/stations"
-        assert stations_url == expected
+        assert hcdp_client._url_stations == f"{hcdp_client.base_url}/stations"
 
-    def test_mesonet_endpoint_url(self):
+    def test_mesonet_endpoint_url(self, hcdp_client):
         """Test mesonet endpoint URL construction."""
-        client = HCDPClient(api_token="test")
-        mesonet_url = f"{client.base_url}/mesonet"
-        
-        expected = f"{client.base_url}/mesonet"
-        assert mesonet_url == expected
+        assert hcdp_client._url_mesonet == f"{hcdp_client.base_url}/mesonet/db/measurements"
 
-    def test_genzip_endpoint_url(self):
+    def test_genzip_endpoint_url(self, hcdp_client):
         """Test data package generation endpoint URL construction."""
-        client = HCDPClient(api_token="test")
-        genzip_url = f"{client.base_url}/genzip"
-        
-        expected = f"{client.base_url}/genzip"
-        assert genzip_url == expected
+        assert hcdp_client._url_genzip_email == f"{hcdp_client.base_url}/genzip/email"
+        assert hcdp_client._url_genzip_link == f"{hcdp_client.base_url}/genzip/instant/link"
 
 
 class TestParameterMappingCompliance:
     """Test that MCP parameters map correctly to API parameters."""
     
-    def test_raster_parameter_mapping(self):
-        """Test that raster parameters map correctly."""
-        args = GetClimateRasterArgs(
-            var="rainfall",
+    @pytest.fixture(scope="class")
+    @classmethod
+    def raster_args_full(cls):
+        """Raster args with every mapped parameter set."""
+        yield from _shared(GetClimateRasterArgs(
+            datatype="rainfall",
+            date="2023-01",
+            extent="bi",
+            location="hawaii",
+            production="new",
+            period="month"
+        ))
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def timeseries_args_full(cls):
+        """Timeseries args with coordinates and dates set."""
+        yield from _shared(GetTimeseriesArgs(
+            datatype="temp_mean",
             start="2023-01-01",
             end="2023-12-31",
+            extent="oa",
+            lat=21.3099,
+            lng=-157.8581,
             location="hawaii",
-            aggregation="month",
-            units="mm",
-            meta="true",
-            fmt="tiff"
-        )
-        
+            aggregation="month"
+        ))
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def station_args_full(cls):
+        """Station data args with a query and pagination."""
+        yield from _shared(GetStationDataArgs(
+            q='{"name": "hcdp_station_metadata"}',
+            limit=10,
+            offset=0
+        ))
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mesonet_args_full(cls):
+        """Mesonet args for one station and variable."""
+        yield from _shared(GetMesonetDataArgs(
+            station_ids="0115",
+            start_date="2023-01-01",
+            end_date="2023-01-31",
+            var_ids="RF_1_Tot300s",
+            location="hawaii"
+        ))
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def package_args_full(cls):
+        """Data package args with email delivery."""
+        yield from _shared(GenerateDataPackageEmailArgs(
+            email="user@example.com",
+            datatype="rainfall",
+            production="new",
+            period="month",
+            extent="statewide",
+            start_date="2023-01",
+            end_date="2023-12"
+        ))
+
+    def test_raster_parameter_mapping(self, raster_args_full):
+        """Test that raster parameters map correctly."""
         # All parameters should have corresponding API parameters
         expected_mappings = {
-            "var": "rainfall",
-            "start": "2023-01-01",
-            "end": "2023-12-31", 
+            "datatype": "rainfall",
+            "date": "2023-01",
+            "extent": "bi",
             "location": "hawaii",
-            "aggregation": "month",
-            "units": "mm",
-            "meta": "true", 
-            "fmt": "tiff"
+            "production": "new",
+            "period": "month"
         }
         
         for param, expected_value in expected_mappings.items():
-            assert hasattr(args, param)
-            assert getattr(args, param) == expected_value
+            assert hasattr(raster_args_full, param)
+            assert getattr(raster_args_full, param) == expected_value
 
-    def test_timeseries_parameter_mapping(self):
+    def test_timeseries_parameter_mapping(self, timeseries_args_full):
         """Test that timeseries parameters map correctly.""" 
-        args = GetTimeseriesArgs(
-            var="temp_mean",
-            lat=21.3099,
-            lng=-157.8581,
-            start="2023-01-01",
-            end="2023-12-31",
-            location="hawaii",
-            aggregation="month"
-        )
-        
-        # Check required coordinate parameters
-        assert args.lat == 21.3099
-        assert args.lng == -157.8581
+        # Check coordinate parameters
+        assert timeseries_args_full.lat == 21.3099
+        assert timeseries_args_full.lng == -157.8581
         
         # Check date parameters
-        assert args.start == "2023-01-01"
-        assert args.end == "2023-12-31"
+        assert timeseries_args_full.start == "2023-01-01"
+        assert timeseries_args_full.end == "2023-12-31"
 
-    def test_station_data_parameter_mapping(self):
+    def test_station_data_parameter_mapping(self, station_args_full):
         """Test that station data parameters map correctly."""
-        args = GetStationDataArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31",
-            location="hawaii",
-            aggregation="month",
-            meta="true",
-            fmt="json",
-            station_id="STAT001"
-        )
+        # Verify the query parameter
+        assert station_args_full.q == '{"name": "hcdp_station_metadata"}'
         
-        # Verify optional station_id parameter
-        assert args.station_id == "STAT001"
-        
-        # Verify other parameters
-        assert args.meta == "true"
-        assert args.fmt == "json"
+        # Verify pagination, including a zero offset
+        assert station_args_full.limit == 10
+        assert station_args_full.offset == 0
 
-    def test_mesonet_parameter_mapping(self):
+    def test_mesonet_parameter_mapping(self, mesonet_args_full):
         """Test that mesonet parameters map correctly."""
-        args = GetMesonetDataArgs(
-            var="wind_speed",
-            start="2023-01-01", 
-            end="2023-01-31",
-            location="hawaii",
-            aggregation="day",
-            station="MESA001"
-        )
-        
-        # Mesonet should default to daily aggregation
-        assert args.aggregation == "day"
-        assert args.station == "MESA001"
+        # Mesonet should join station metadata by default
+        assert mesonet_args_full.join_metadata is True
+        assert mesonet_args_full.station_ids == "0115"
+        assert mesonet_args_full.var_ids == "RF_1_Tot300s"
 
-    def test_data_package_parameter_mapping(self):
+    def test_data_package_parameter_mapping(self, package_args_full):
         """Test that data package parameters map correctly."""
-        args = GenerateDataPackageArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31",
-            location="hawaii",
-            aggregation="month",
-            fmt="tiff",
-            email="user@example.com",
-            instant="false"
-        )
-        
-        # Check email and instant parameters
-        assert args.email == "user@example.com"
-        assert args.instant == "false"
+        # Check email and dataset parameters
+        assert package_args_full.email == "user@example.com"
+        assert package_args_full.datatype == "rainfall"
+        assert package_args_full.extent == "statewide"
 
 
 class TestRequiredParameterValidation:
     """Test validation of required vs optional parameters."""
     
-    def test_raster_required_parameters(self):
+    @pytest.mark.parametrize("kwargs", [
+        {},                        # No required parameters
+        {"datatype": "rainfall"},  # Missing date, extent
+    ])
+    def test_raster_missing_required(self, kwargs):
         """Test that required raster parameters are enforced."""
-        # Should require var, start, end
-        with pytest.raises(TypeError):
-            GetClimateRasterArgs()  # No required parameters
-            
-        with pytest.raises(TypeError):
-            GetClimateRasterArgs(var="rainfall")  # Missing start, end
-            
-        # Should work with all required parameters
+        with pytest.raises(ValidationError):
+            GetClimateRasterArgs(**kwargs)
+
+    def test_raster_required_parameters(self):
+        """Test that raster args build with all required parameters (datatype, date, extent)."""
         args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide"
         )
-        assert args.var == "rainfall"
+        assert args.datatype == "rainfall"
 
-    def test_timeseries_required_parameters(self):
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"datatype": "rainfall", "lat": 21.3},  # Missing dates, extent
+    ])
+    def test_timeseries_missing_required(self, kwargs):
         """Test that required timeseries parameters are enforced."""
-        # Should require var, lat, lng, start, end
-        with pytest.raises(TypeError):
-            GetTimeseriesArgs()
-            
-        with pytest.raises(TypeError):
-            GetTimeseriesArgs(var="rainfall", lat=21.3)  # Missing lng, dates
-            
-        # Should work with all required parameters
+        with pytest.raises(ValidationError):
+            GetTimeseriesArgs(**kwargs)
+
+    def test_timeseries_required_parameters(self):
+        """Test that timeseries args build with all required parameters (datatype, start, end, extent)."""
         args = GetTimeseriesArgs(
-            var="rainfall",
-            lat=21.3099,
-            lng=-157.8581,
+            datatype="rainfall",
             start="2023-01-01",
-            end="2023-12-31"
+            end="2023-12-31",
+            extent="oa"
         )
-        assert args.lat == 21.3099
+        assert args.extent == "oa"
 
-    def test_optional_parameter_defaults(self):
-        """Test that optional parameters have correct defaults."""
-        # Test raster defaults
-        raster_args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
-        )
-        assert raster_args.location == "hawaii"
-        assert raster_args.aggregation == "month"
-        assert raster_args.meta == "true"
-        assert raster_args.fmt == "tiff"
-        assert raster_args.units is None
-        
-        # Test timeseries defaults
-        ts_args = GetTimeseriesArgs(
-            var="rainfall",
-            lat=21.3,
-            lng=-157.8,
-            start="2023-01-01",
-            end="2023-12-31"
-        )
-        assert ts_args.location == "hawaii"
-        assert ts_args.aggregation == "month"
-        assert ts_args.units is None
+    @pytest.mark.parametrize("field, expected", _RASTER_DEFAULTS.items())
+    def test_raster_optional_parameter_defaults(self, raster_minimal_args, field, expected):
+        """Test that optional raster parameters have correct defaults."""
+        assert getattr(raster_minimal_args, field) == expected
+
+    @pytest.mark.parametrize("field, expected", _TS_DEFAULTS.items())
+    def test_timeseries_optional_parameter_defaults(self, ts_minimal_args, field, expected):
+        """Test that optional timeseries parameters have correct defaults."""
+        assert getattr(ts_minimal_args, field) == expected
 
 
 class TestAPISpecificationGaps:
-    """Identify gaps between implementation and API specification."""
+    """Check parameters and endpoints the API specification calls for."""
     
-    def test_missing_extent_parameter(self):
-        """Test for missing extent parameter in raster requests."""
-        # According to API spec, raster endpoint should have extent parameter
-        # Current implementation doesn't include this
+    def test_extent_parameter(self):
+        """Test that raster requests carry the spec's extent parameter."""
         args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide"
         )
-        
-        # extent parameter is missing from current implementation
-        assert not hasattr(args, "extent")
-        # This indicates a potential gap in the implementation
+        assert args.extent == "statewide"
 
-    def test_missing_production_parameter(self):
-        """Test for missing production parameter."""
-        # API spec mentions production parameter for different methodologies
+    def test_production_parameter(self):
+        """Test that the spec's production parameter is optional."""
+        # Production selects the methodology (new/final) for rainfall
         args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide"
         )
-        
-        # production parameter is missing
-        assert not hasattr(args, "production")
+        assert args.production is None
 
-    def test_missing_period_parameter(self):
-        """Test for missing period parameter."""
-        # API spec includes period parameter
+    def test_period_parameter(self):
+        """Test that the spec's period parameter is optional."""
         args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01", 
-            end="2023-12-31"
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide",
+            period="month"
         )
-        
-        # period parameter is missing
-        assert not hasattr(args, "period")
+        assert args.period == "month"
 
-    def test_mesonet_endpoint_variants(self):
-        """Test for missing mesonet endpoint variants."""
-        # API spec has multiple mesonet endpoints like /mesonet/db/measurements
-        # Current implementation only has generic /mesonet
-        
-        # This test documents that the implementation may not cover
-        # all mesonet endpoint variants from the specification
-        client = HCDPClient(api_token="test")
-        
-        # Current implementation uses /mesonet
-        # But spec suggests /mesonet/db/measurements and other variants
-        current_url = f"{client.base_url}/mesonet"
-        spec_url = f"{client.base_url}/mesonet/db/measurements"
-        
-        assert current_url != spec_url  # Indicates potential mismatch
+    def test_mesonet_endpoint_variants(self, hcdp_client):
+        """Test that the mesonet endpoint variants from the spec are covered."""
+        mesonet = f"{hcdp_client.base_url}/mesonet/db"
+        assert hcdp_client._url_mesonet == f"{mesonet}/measurements"
+        assert hcdp_client._url_mesonet_stations == f"{mesonet}/stations"
+        assert hcdp_client._url_mesonet_variables == f"{mesonet}/variables"
+        assert hcdp_client._url_mesonet_station_monitor == f"{mesonet}/stationMonitor"
 
     def test_stations_query_parameter_format(self):
         """Test stations query parameter format compliance."""
-        # API spec suggests complex JSON query structure for stations
-        # Current implementation uses simple parameters
-        
-        args = GetStationDataArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
-        )
-        
-        # Current implementation doesn't have complex query parameter
-        assert not hasattr(args, "query")
-        # This may indicate simplified parameter structure vs. API spec
+        # The spec's stations endpoint takes a JSON query string
+        query = '{"name": "hcdp_station_metadata"}'
+        args = GetStationDataArgs(q=query)
+        assert args.q == query
 
 
 class TestDataTypesAndValidation:
     """Test data types and validation requirements."""
     
-    def test_coordinate_data_types(self):
-        """Test that coordinates are properly typed as floats."""
-        args = GetTimeseriesArgs(
-            var="rainfall",
-            lat=21.3099,  # Should be float
-            lng=-157.8581, # Should be float
+    @pytest.fixture(scope="class")
+    @classmethod
+    def std_ts_args(cls):
+        """Timeseries args with float coordinates, shared by the class."""
+        yield from _shared(GetTimeseriesArgs(
+            datatype="rainfall",
             start="2023-01-01",
-            end="2023-12-31"
-        )
-        
-        assert isinstance(args.lat, float)
-        assert isinstance(args.lng, float)
+            end="2023-12-31",
+            extent="oa",
+            lat=21.3099,  # Should be float
+            lng=-157.8581  # Should be float
+        ))
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def std_raster_args(cls):
+        """Raster args with only the required parameters, shared by the class."""
+        yield from _shared(GetClimateRasterArgs(
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide"
+        ))
+
+    def test_coordinate_data_types(self, std_ts_args):
+        """Test that coordinates are properly typed as floats."""
+        for attr in ("lat", "lng"):
+            assert isinstance(getattr(std_ts_args, attr), float)
 
-    def test_date_string_format(self):
+    def test_date_string_format(self, std_ts_args):
         """Test that dates are handled as strings in YYYY-MM-DD format."""
-        args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31"
-        )
-        
-        assert isinstance(args.start, str)
-        assert isinstance(args.end, str)
+        for attr in ("start", "end"):
+            assert isinstance(getattr(std_ts_args, attr), str)
         
         # Should match YYYY-MM-DD format
-        assert len(args.start) == 10
-        assert args.start[4] == "-"
-        assert args.start[7] == "-"
+        assert len(std_ts_args.start) == 10
+        assert std_ts_args.start[4] == "-"
+        assert std_ts_args.start[7] == "-"
 
-    def test_boolean_parameters_as_strings(self):
-        """Test that boolean parameters are handled as strings."""
-        args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31",
-            meta="false"
-        )
+    def test_boolean_parameters_from_strings(self):
+        """Test that boolean parameters accept "true"/"false" strings."""
+        args = GetMesonetDataArgs(join_metadata="false")
         
-        # meta should be string "true"/"false", not boolean
-        assert isinstance(args.meta, str)
-        assert args.meta in ["true", "false"]
+        # join_metadata is coerced to a real boolean for the client
+        assert args.join_metadata is False
 
-    def test_optional_string_parameters(self):
+    def test_optional_string_parameters(self, std_raster_args):
         """Test handling of optional string parameters."""
-        args = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31",
-            units=None
-        )
-        
         # Optional parameter should be None when not provided
-        assert args.units is None
+        assert std_raster_args.production is None
         
         # Should accept string when provided
-        args_with_units = GetClimateRasterArgs(
-            var="rainfall",
-            start="2023-01-01",
-            end="2023-12-31",
-            units="mm"
+        args_with_production = GetClimateRasterArgs(
+            datatype="rainfall",
+            date="2023-01",
+            extent="statewide",
+            production="new"
         )
-        assert args_with_units.units == "mm"
-        assert isinstance(args_with_units.units, str)
\ No newline at end of file
+        assert args_with_production.production == "new"
+        assert isinstance(args_with_production.production, str)
@@ -11,44 +11,46 @@ async def test_hcdp_api():
     print("Testing HCDP API with corrected configuration...")
     print("=" * 50)
     
-    client = HCDPClient()
-    print(f"Base URL: {client.base_url}")
-    print(f"API Token: {client.api_token[:10]}...")
-    
-    # Test rainfall data for February 2022 (matching the API docs example)
-    try:
-        print(f"\n1. Testing rainfall data for February 2022, Big Island:")
-        result = await client.get_raster_data(
-            datatype="rainfall",
-            date="2022-02", 
-            extent="bi",
-            production="new",
-            period="month"
-        )
-        print("SUCCESS! Rainfall data retrieved")
-        print(f"Response type: {type(result)}")
-        if isinstance(result, dict):
-            print(f"Keys: {list(result.keys())}")
-            
-    except Exception as e:
-        print(f"ERROR: {e}")
+    async with HCDPClient() as client:
+        print(f"Base URL: {client.base_url}")
+        print(f"API Token: {client.api_token[:10]}...")
         
-    # Test temperature data 
-    try:
-        print(f"\n2. Testing temperature data for November 2024, Statewide:")
-        result = await client.get_raster_data(
-            datatype="temp_mean",
-            date="2024-11",
-            extent="statewide", 
-            aggregation="month"  # Temperature uses 'aggregation', not 'production'
-        )
-        print("SUCCESS! Temperature data retrieved")
+        # The probes are independent, so they share the client's connection
+        # pool and run concurrently; one failure doesn't cancel the others
+        probes = [
+            (
+                "1. Testing rainfall data for February 2022, Big Island:",
+                "Rainfall",
+                client.get_raster_data(
+                    datatype="rainfall",
+                    date="2022-02", 
+                    extent="bi",
+                    production="new",
+                    period="month"
+                ),
+            ),
+            (
+                "2. Testing temperature data for November 2024, Statewide:",
+                "Temperature",
+                client.get_raster_data(
+                    datatype="temp_mean",
+                    date="2024-11",
+                    extent="statewide", 
+                    aggregation="month"  # Temperature uses 'aggregation', not 'production'
+                ),
+            ),
+        ]
+        results = await asyncio.gather(*(call for _, _, call in probes), return_exceptions=True)
+    
+    for (heading, label, _), result in zip(probes, results):
+        print(f"\n{heading}")
+        if isinstance(result, Exception):
+            print(f"ERROR: {result}")
+            continue
+        print(f"SUCCESS! {label} data retrieved")
         print(f"Response type: {type(result)}")
         if isinstance(result, dict):
             print(f"Keys: {list(result.keys())}")
-            
-    except Exception as e:
-        print(f"ERROR: {e}")
 
 if __name__ == "__main__":
     asyncio.run(test_hcdp_api())
\ No newline at end of file
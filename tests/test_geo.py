@@ -0,0 +1,217 @@
+"""Tests for the vectorized station geometry helpers."""
+
+import math
+
+import numpy as np
+import pytest
+
+from hcdp_mcp_server import geo
+from hcdp_mcp_server.geo import (
+    STATION_INDEX_TTL, PointSet, StationIndex, coerce_floats, cosine_distance_km, haversine_km,
+    station_index
+)
+
+
+OAHU_BOUNDS = (21.2, 21.8, -158.3, -157.6)
+
+STATIONS = [
+    {"station_id": "0115", "lat": "21.3069", "lng": "-157.8583"},  # Honolulu
+    {"station_id": "0281", "lat": 19.7241, "lng": -155.0868},      # Hilo
+    {"station_id": "0502", "lat": "bad", "lng": "-157.9"},
+    {"station_id": "0611", "lat": None, "lng": -157.9},
+    {"lat": 21.4, "lng": -157.8},                                  # no id
+    {"station_id": "0154", "lat": 21.5028, "lng": -158.0236},      # Wahiawa
+]
+
+
+class TestStationIndex:
+    """Test building and querying the columnar station index."""
+
+    def test_malformed_coordinates_become_nan(self):
+        """Test that unparseable coordinates are coerced once to NaN."""
+        index = StationIndex(STATIONS)
+        assert len(index) == len(STATIONS)
+        assert index.lat.dtype == np.float64
+        assert np.isnan(index.lat[2]) and np.isnan(index.lat[3])
+        assert index.lat[0] == 21.3069
+
+    def test_coerce_floats_fast_and_fallback_paths(self):
+        """Test clean inputs convert in bulk and malformed ones fall back to NaN."""
+        clean = coerce_floats(["21.3", 19, None, 20.5])
+        assert np.isnan(clean[2])
+        assert clean[[0, 1, 3]].tolist() == [21.3, 19.0, 20.5]
+
+        mixed = coerce_floats(["21.3", "n/a", {"lat": 1}, 20.5, None, 7])
+        assert np.isnan(mixed[[1, 2, 4]]).all()
+        assert mixed[[0, 3, 5]].tolist() == [21.3, 20.5, 7.0]
+        assert coerce_floats([]).shape == (0,)
+
+        series = coerce_floats({"2024-01": 20, "2024-02": None, "2024-03": "21.5"}.values())
+        assert np.isnan(series[1]) and series[[0, 2]].tolist() == [20.0, 21.5]
+
+    def test_bounding_box_filter_matches_scalar_loop(self):
+        """Test that the mask agrees with the per-row comparison it replaces."""
+        lat_min, lat_max, lng_min, lng_max = OAHU_BOUNDS
+        expected = []
+        for s in STATIONS:
+            try:
+                slat, slng = float(s["lat"]), float(s["lng"])
+                if lat_min <= slat <= lat_max and lng_min <= slng <= lng_max:
+                    expected.append(s["station_id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        assert station_index(STATIONS).ids_in_bounds(OAHU_BOUNDS) == expected == ["0115", "0154"]
+
+    def test_index_is_reused_until_ttl_expires(self):
+        """Test that re-fetched listings reuse the index until it expires."""
+        first = station_index(STATIONS, "ttl_test")
+        assert station_index(STATIONS, "ttl_test") is first
+        assert station_index(list(STATIONS), "ttl_test") is first
+
+        first.built_at -= STATION_INDEX_TTL + 1
+        refreshed = station_index(list(STATIONS), "ttl_test")
+        assert refreshed is not first
+        assert station_index(list(STATIONS), "ttl_test") is refreshed
+
+    def test_refreshed_roster_rebuilds_index(self):
+        """Test that a re-fetched roster with new rows replaces the index."""
+        first = station_index(STATIONS, "refresh_test")
+        refreshed = [dict(s) for s in STATIONS]
+        assert station_index(refreshed, "refresh_test") is not first
+        assert station_index(list(refreshed), "refresh_test") is station_index(refreshed, "refresh_test")
+
+    def test_empty_listing_is_not_cached(self):
+        """Test that a failed, empty station fetch doesn't pin an empty index."""
+        assert len(station_index([], "empty_test")) == 0
+        assert len(station_index(STATIONS, "empty_test")) == len(STATIONS)
+
+    def test_ids_by_bounds_groups_once_per_table(self):
+        """Test that per-island station lists are computed once and reused."""
+        index = StationIndex(STATIONS)
+        table = {"oahu": OAHU_BOUNDS, "nowhere": (0.0, 1.0, 0.0, 1.0)}
+        groups = index.ids_by_bounds(table)
+        assert groups == {"oahu": ["0115", "0154"], "nowhere": []}
+        assert index.ids_by_bounds(table) is groups
+
+
+class TestHaversine:
+    """Test the scalar and vectorized great-circle distance."""
+
+    def test_scalar_matches_atan2_formula(self):
+        """Test Honolulu to Hilo against the original atan2 Haversine form."""
+        lat1, lon1, lat2, lon2 = 21.3069, -157.8583, 19.7241, -155.0868
+        dlat = math.radians(lat2 - lat1)
+        dlon = math.radians(lon2 - lon1)
+        a = math.sin(dlat/2) ** 2 + \
+            math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2) ** 2
+        expected = 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        assert haversine_km(lat1, lon1, lat2, lon2) == pytest.approx(expected)
+
+    def test_vector_matches_scalar(self):
+        """Test that the array path agrees with the scalar path per element."""
+        lats = np.array([21.3069, 19.7241, 21.9811])
+        lngs = np.array([-157.8583, -155.0868, -159.3711])
+        vec = haversine_km(21.4, -157.9, lats, lngs)
+        assert isinstance(vec, np.ndarray)
+        for i in range(3):
+            assert vec[i] == pytest.approx(haversine_km(21.4, -157.9, float(lats[i]), float(lngs[i])))
+
+    def test_cosine_law_agrees_with_haversine(self):
+        """Test the cheaper cosine form against Haversine at station scales."""
+        lats = np.array([21.3069, 21.31, 19.7241, -14.2794])
+        lngs = np.array([-157.8583, -157.86, -155.0868, -170.7006])
+        expected = haversine_km(21.3069, -157.8583, lats, lngs)
+        assert np.allclose(cosine_distance_km(21.3069, -157.8583, lats, lngs), expected, atol=1e-3)
+        assert cosine_distance_km(21.3069, -157.8583, 21.3069, -157.8583) == pytest.approx(0, abs=1e-3)
+
+    def test_radius_mask_matches_distance_threshold(self):
+        """Test the precomputed-trig mask against explicit distances."""
+        rng = np.random.default_rng(0)
+        stations = [
+            {"station_id": str(i), "lat": lat, "lng": lng}
+            for i, (lat, lng) in enumerate(zip(rng.uniform(18.9, 22.3, 500), rng.uniform(-160, -154.8, 500)))
+        ]
+        index = StationIndex(stations)
+        for radius in (5, 15, 60):
+            expected = cosine_distance_km(21.3069, -157.8583, index.lat, index.lng) <= radius
+            assert np.array_equal(index.within_radius(21.3069, -157.8583, radius), expected)
+
+    def test_radius_query_matches_per_station_haversine_loop(self):
+        """Test the indexed city lookup against the scalar loop it replaced."""
+        expected = []
+        for s in STATIONS:
+            try:
+                if haversine_km(21.3069, -157.8583, float(s["lat"]), float(s["lng"])) <= 30:
+                    expected.append(s["station_id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        assert StationIndex(STATIONS).ids_within_radius(21.3069, -157.8583, 30) == expected
+
+    def test_ids_within_radius_skips_bad_rows(self):
+        """Test the radius query around Honolulu ignores malformed stations."""
+        index = StationIndex(STATIONS)
+        assert index.ids_within_radius(21.3069, -157.8583, 15) == ["0115"]
+        assert index.ids_within_radius(21.3069, -157.8583, 30) == ["0115", "0154"]
+
+    @pytest.mark.skipif(geo._radius_scan is None, reason="numba not installed")
+    def test_compiled_scan_matches_numpy_mask(self, monkeypatch):
+        """Test the numba radius kernel against the vectorized NumPy mask."""
+        rng = np.random.default_rng(1)
+        stations = [
+            {"station_id": str(i), "lat": lat, "lng": lng}
+            for i, (lat, lng) in enumerate(zip(rng.uniform(18.9, 22.3, 1000), rng.uniform(-160, -154.8, 1000)))
+        ]
+        stations[3]["lat"] = None
+        index = StationIndex(stations)
+        compiled = [index.ids_within_radius(21.3069, -157.8583, r) for r in (5, 15, 60)]
+
+        monkeypatch.setattr(geo, "_radius_scan", None)
+        assert compiled == [index.ids_within_radius(21.3069, -157.8583, r) for r in (5, 15, 60)]
+
+    @pytest.mark.skipif(geo._radius_scan is None, reason="numba not installed")
+    def test_warm_up_jit_compiles_the_query_signature(self):
+        """Test that warming up leaves a compiled kernel for real radius queries."""
+        geo.warm_up_jit()
+        compiled = list(geo._radius_scan.signatures)
+        assert compiled
+
+        StationIndex(STATIONS).ids_within_radius(21.3069, -157.8583, 15)
+        assert list(geo._radius_scan.signatures) == compiled
+
+    def test_warm_up_jit_without_numba(self, monkeypatch):
+        """Test that warming up is a no-op when numba is not installed."""
+        monkeypatch.setattr(geo, "_radius_scan", None)
+        geo.warm_up_jit()
+
+
+    @pytest.mark.skipif(geo.cKDTree is None, reason="scipy not installed")
+    def test_kdtree_matches_linear_scan(self, monkeypatch):
+        """Test the k-d tree radius path against the linear scan."""
+        rng = np.random.default_rng(2)
+        stations = [
+            {"station_id": str(i), "lat": lat, "lng": lng}
+            for i, (lat, lng) in enumerate(zip(rng.uniform(18.9, 22.3, 1000), rng.uniform(-160, -154.8, 1000)))
+        ]
+        stations[7]["lng"] = "bad"
+        index = StationIndex(stations)
+        linear = [index.ids_within_radius(21.3069, -157.8583, r) for r in (5, 15, 60)]
+
+        monkeypatch.setattr(geo, "KDTREE_MIN_STATIONS", 0)
+        assert [index.ids_within_radius(21.3069, -157.8583, r) for r in (5, 15, 60)] == linear
+        assert index._tree is not None
+
+class TestPointSet:
+    """Test the columnar named-point table."""
+
+    def test_iterates_names_with_plain_float_coordinates(self):
+        """Test that iteration preserves order and yields Python floats."""
+        points = PointSet({
+            "Honolulu": {"lat": 21.3069, "lng": -157.8583},
+            "Hilo": {"lat": 19.7241, "lng": -155.0868},
+        })
+        rows = list(points)
+        assert len(points) == 2
+        assert rows == [("Honolulu", 21.3069, -157.8583), ("Hilo", 19.7241, -155.0868)]
+        assert all(type(v) is float for _, lat, lng in rows for v in (lat, lng))
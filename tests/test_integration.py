@@ -1,11 +1,17 @@
 """Integration tests for HCDP MCP Server with realistic scenarios."""
 
 import pytest
+import asyncio
+import base64
 import json
 from unittest.mock import patch, Mock, AsyncMock
 from datetime import datetime, timedelta
 
-from hcdp_mcp_server.server import handle_call_tool
+from mcp import types
+from pydantic import TypeAdapter
+
+from hcdp_mcp_server import server
+from hcdp_mcp_server.server import handle_call_tool, last_year_month_range
 from hcdp_mcp_server.client import HCDPClient
 
 
@@ -552,4 +558,357 @@ class TestPerformanceConsiderations:
             
             data = json.loads(result[0].text)
             assert data["status"] == "queued"
-            assert "queue_position" in data
\ No newline at end of file
+            assert "queue_position" in data
+
+class TestStationAggregationTools:
+    """Test the current-conditions tools that aggregate mesonet stations."""
+
+    @pytest.fixture
+    def mock_station_client(self):
+        """Mock client with 25 Oahu stations and one reading per station."""
+        with patch('hcdp_mcp_server.server.HCDPClient') as mock_client_class:
+            mock_instance = Mock()
+            mock_client_class.return_value = mock_instance
+
+            mock_instance.get_mesonet_stations = AsyncMock(return_value=[
+                {"station_id": f"OA{i:02d}", "lat": 21.30 + i * 0.001, "lng": -157.85}
+                for i in range(25)
+            ])
+
+            async def measurements(station_ids, **kwargs):
+                return [{"station_id": sid, "temperature": "25.0"} for sid in station_ids.split(",")]
+
+            mock_instance.get_mesonet_data = AsyncMock(side_effect=measurements)
+            yield mock_instance
+
+    @pytest.mark.asyncio
+    async def test_island_summary_fetches_stations_in_batches(self, mock_station_client):
+        """Test that island station IDs are split into concurrent mesonet batches."""
+        result = await handle_call_tool("get_island_current_summary", {
+            "island": "oahu",
+            "datatype": "temperature"
+        })
+
+        data = json.loads(result[0].text)
+        assert data["station_count"] == 25
+        assert data["average"] == 25.0
+
+        calls = mock_station_client.get_mesonet_data.call_args_list
+        batches = [call.kwargs["station_ids"].split(",") for call in calls]
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert sum(batches, []) == [f"OA{i:02d}" for i in range(25)]
+        assert all(call.kwargs["var_ids"] == "temperature" for call in calls)
+        assert all(call.kwargs["join_metadata"] is False for call in calls)
+
+    @pytest.mark.asyncio
+    async def test_island_summary_skips_unparseable_readings(self, mock_station_client):
+        """Test that min/max/average come from the numeric readings only."""
+        readings = ["20.5", "bad", None, 30.5, "25"]
+
+        async def measurements(station_ids, **kwargs):
+            return [
+                {"station_id": sid, "temperature": readings[int(sid[2:]) % len(readings)]}
+                for sid in station_ids.split(",")
+            ]
+
+        mock_station_client.get_mesonet_data.side_effect = measurements
+        result = await handle_call_tool("get_island_current_summary", {
+            "island": "oahu",
+            "datatype": "temperature"
+        })
+
+        data = json.loads(result[0].text)
+        assert data["station_count"] == 15
+        assert data["min"] == 20.5
+        assert data["max"] == 30.5
+        assert data["average"] == 25.33
+
+    @pytest.mark.asyncio
+    async def test_compare_fetches_current_and_historical_concurrently(self, mock_station_client):
+        """Test that the historical request is issued while stations are loading."""
+        historical_started = asyncio.Event()
+        stations = mock_station_client.get_mesonet_stations.return_value
+
+        async def stations_after_historical(**kwargs):
+            await historical_started.wait()
+            return stations
+
+        async def timeseries(**kwargs):
+            historical_started.set()
+            return {"2025-01": 24.0}
+
+        mock_station_client.get_mesonet_stations = AsyncMock(side_effect=stations_after_historical)
+        mock_station_client.get_timeseries_data = AsyncMock(side_effect=timeseries)
+        result = await asyncio.wait_for(handle_call_tool("compare_current_vs_historical", {
+            "city": "honolulu",
+            "datatype": "temperature"
+        }), timeout=5)
+
+        data = json.loads(result[0].text)
+        assert data["current_value"] == 25.0
+        assert data["historical_avg"] == 24.0
+
+    @pytest.mark.asyncio
+    async def test_island_history_drops_fill_values(self, mock_station_client):
+        """Test that -9999, None and junk entries are left out of the statistics."""
+        mock_station_client.get_timeseries_data = AsyncMock(return_value={
+            "2024-01": 20.0, "2024-02": -9999, "2024-03": None, "2024-04": "n/a", "2024-05": 24
+        })
+        result = await handle_call_tool("get_island_history_summary", {
+            "island": "oahu",
+            "year": "2024",
+            "datatype": "temperature"
+        })
+
+        data = json.loads(result[0].text)
+        assert data["island_wide_average"] == 22.0
+        for point in data["regional_breakdown"]:
+            assert point["min"] == 20.0 and point["max"] == 24.0 and point["data_points"] == 2
+
+    @pytest.mark.asyncio
+    async def test_island_history_caps_concurrent_requests(self, mock_station_client, monkeypatch):
+        """Test that HCDP_MAX_CONCURRENCY bounds in-flight timeseries requests."""
+        monkeypatch.setenv("HCDP_MAX_CONCURRENCY", "2")
+        in_flight = peak = 0
+
+        async def timeseries(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {"2024-01": 20.0}
+
+        mock_station_client.get_timeseries_data = AsyncMock(side_effect=timeseries)
+        result = await handle_call_tool("get_island_history_summary", {
+            "island": "oahu",
+            "year": "2024",
+            "datatype": "temperature"
+        })
+
+        assert json.loads(result[0].text)["island_wide_average"] == 20.0
+        assert mock_station_client.get_timeseries_data.await_count > 2
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_city_names_are_case_insensitive(self, mock_station_client):
+        """Test that city arguments are normalized before the lookup."""
+        result = await handle_call_tool("get_city_current_weather", {
+            "city": "Honolulu",
+            "datatype": "temperature"
+        })
+
+        data = json.loads(result[0].text)
+        assert data["city"] == "honolulu"
+        assert data["station_count"] == 25
+
+    @pytest.mark.asyncio
+    async def test_precipitation_history_uses_rainfall_parameters(self, mock_station_client):
+        """Test that 'precipitation' maps to the full rainfall request parameters."""
+        mock_station_client.get_timeseries_data = AsyncMock(return_value={"2024-01": 100.0})
+        await handle_call_tool("get_island_history_summary", {
+            "island": "oahu",
+            "year": "2024",
+            "datatype": "precipitation"
+        })
+
+        kwargs = mock_station_client.get_timeseries_data.call_args.kwargs
+        assert (kwargs["datatype"], kwargs["production"], kwargs["aggregation"], kwargs["period"]) == \
+            ("rainfall", "new", None, "month")
+
+
+class TestDateHelpers:
+    """Test the date helpers behind the current and historical tools."""
+
+    def test_last_year_month_range_handles_month_ends(self):
+        """Test the historical window, including leap days and December."""
+        assert last_year_month_range(datetime(2024, 2, 29)) == ("2023-02-01", "2023-02-28")
+        assert last_year_month_range(datetime(2025, 2, 10)) == ("2024-02-01", "2024-02-29")
+        assert last_year_month_range(datetime(2025, 12, 31)) == ("2024-12-01", "2024-12-31")
+
+    def test_today_is_formatted_once_per_interval(self):
+        """Test that today's date string is cached until it expires."""
+        server._today["expires"] = 0.0
+        assert server.today_str() == datetime.now().strftime("%Y-%m-%d")
+
+        server._today["date"] = "cached"
+        assert server.today_str() == "cached"
+
+        server._today["expires"] = 0.0
+        assert server.today_str() == datetime.now().strftime("%Y-%m-%d")
+
+
+class TestSharedClient:
+    """Test the pooled HCDPClient shared by all tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_close_client_releases_shared_pool(self):
+        """Test that shutdown closes the shared client and a later call makes a new one."""
+        with patch('hcdp_mcp_server.server.HCDPClient') as mock_client_class:
+            first = Mock(close=AsyncMock())
+            second = Mock(close=AsyncMock())
+            mock_client_class.side_effect = [first, second]
+
+            assert server.get_client() is server.get_client() is first
+            await server.close_client()
+            first.close.assert_awaited_once()
+            await server.close_client()
+            assert server.get_client() is second
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_share_one_client(self):
+        """Test that repeated tool calls reuse a single pooled client."""
+        with patch('hcdp_mcp_server.server.HCDPClient') as mock_client_class:
+            mock_instance = Mock()
+            mock_instance.get_mesonet_stations = AsyncMock(return_value=[])
+            mock_client_class.return_value = mock_instance
+
+            await handle_call_tool("get_mesonet_stations", {})
+            await handle_call_tool("get_mesonet_stations", {})
+
+            mock_client_class.assert_called_once()
+            assert mock_instance.get_mesonet_stations.await_count == 2
+
+
+class TestArgumentValidation:
+    """Test how tool arguments are validated and forwarded to the client."""
+
+    def test_string_coordinates_validate_to_floats(self):
+        """Test that string coordinates are cast while the schema still accepts strings."""
+        validate = server.ARG_ADAPTERS["get_timeseries_data"].validate_python
+        args = validate({"datatype": "rainfall", "start": "2024-01-01", "end": "2024-01-31",
+                         "extent": "oa", "lat": "21.3", "lng": ""})
+        assert args.lat == 21.3 and type(args.lat) is float
+        assert args.lng is None
+        assert not hasattr(args, "__dict__")
+
+        schema = server.ARG_ADAPTERS["get_timeseries_data"].json_schema()["properties"]["lat"]
+        assert {"type": "string"} in schema["anyOf"]
+
+    def test_common_names_validate_to_api_codes(self):
+        """Test that island and variable names resolve to extent and datatype codes."""
+        validate = server.ARG_ADAPTERS["get_timeseries_data"].validate_python
+        base = {"start": "2024-01-01", "end": "2024-01-31"}
+        args = validate({**base, "datatype": "Precipitation", "extent": "Big_Island"})
+        assert (args.datatype, args.extent) == ("rainfall", "bi")
+        args = validate({**base, "datatype": "temp_max", "extent": "oa"})
+        assert (args.datatype, args.extent) == ("temp_max", "oa")
+
+    @pytest.mark.asyncio
+    async def test_passthrough_tools_forward_only_set_arguments(self):
+        """Test that validated fields are splatted into the client call, minus unset ones."""
+        with patch('hcdp_mcp_server.server.HCDPClient') as mock_client_class:
+            mock_instance = mock_client_class.return_value
+            mock_instance.get_timeseries_data = AsyncMock(return_value={"2024-01": 1.0})
+            await handle_call_tool("get_timeseries_data", {
+                "datatype": "rainfall",
+                "start": "2024-01",
+                "end": "2024-02",
+                "extent": "oa",
+                "lat": "21.3",
+                "lng": -157.8
+            })
+
+        mock_instance.get_timeseries_data.assert_awaited_once_with(
+            datatype="rainfall", start="2024-01", end="2024-02", extent="oa",
+            lat=21.3, lng=-157.8, location="hawaii"
+        )
+
+
+class TestBinaryResults:
+    """Test how binary payloads are returned to MCP clients."""
+
+    @pytest.mark.asyncio
+    async def test_binary_results_return_blob_resource(self):
+        """Test that bytes payloads become a blob resource, not JSON text."""
+        validate = server.ARG_ADAPTERS["get_station_data"].validate_python
+
+        async def raster(args, client):
+            return {"data": b"II*\x00tiff", "status": "ok"}
+
+        with patch.dict(server.TOOL_DISPATCH, {"get_station_data": (validate, raster)}), \
+                patch('hcdp_mcp_server.server.HCDPClient'):
+            result = await handle_call_tool("get_station_data", {"q": "x"})
+
+        metadata = json.loads(result[0].text)
+        assert metadata == {"status": "ok", "media_type": "image/tiff", "size_bytes": 8}
+        blob = result[1].resource
+        assert blob.mimeType == "image/tiff"
+        assert base64.b64decode(blob.blob) == b"II*\x00tiff"
+
+    @pytest.mark.asyncio
+    async def test_binary_media_type_is_sniffed(self):
+        """Test that TIFF stays a resource while PNG becomes inline image content."""
+        payloads = {"tiff": b"II*\x00rest", "png": b"\x89PNG\r\n\x1a\nrest"}
+
+        validate = server.ARG_ADAPTERS["get_station_data"].validate_python
+
+        async def raster(args, client):
+            return {"data": payloads[args.q]}
+
+        with patch.dict(server.TOOL_DISPATCH, {"get_station_data": (validate, raster)}), \
+                patch('hcdp_mcp_server.server.HCDPClient'):
+            tiff = await handle_call_tool("get_station_data", {"q": "tiff"})
+            png = await handle_call_tool("get_station_data", {"q": "png"})
+
+        assert tiff[1].type == "resource" and tiff[1].resource.mimeType == "image/tiff"
+        assert png[1].type == "image" and png[1].mimeType == "image/png"
+        assert base64.b64decode(png[1].data) == payloads["png"]
+
+
+class TestProtocolHandlers:
+    """Test the tools/list and tools/call handlers registered with the SDK."""
+
+    @pytest.mark.asyncio
+    async def test_list_tools_reuses_prebuilt_schemas(self):
+        """Test that listing tools never regenerates pydantic JSON schemas."""
+        with patch.object(TypeAdapter, "json_schema", side_effect=AssertionError("rebuilt")):
+            first = await server.handle_list_tools()
+            second = await server.handle_list_tools()
+
+        assert first is second is server.TOOLS
+        assert all(tool.inputSchema["type"] == "object" for tool in first)
+        assert not any("\n        " in tool.description for tool in first)
+
+    @pytest.mark.asyncio
+    async def test_tools_list_request_serves_prebuilt_result(self):
+        """Test that the SDK's tools/list handler returns the result built at import."""
+        handler = server.app.request_handlers[types.ListToolsRequest]
+        response = await handler(types.ListToolsRequest(method="tools/list"))
+
+        assert response.root is server.LIST_TOOLS_RESULT
+        assert response.root.tools == server.TOOLS
+
+    @pytest.mark.asyncio
+    async def test_sdk_skips_duplicate_jsonschema_validation(self):
+        """Test that tool calls are validated by pydantic only, not jsonschema too."""
+        handler = server.app.request_handlers[types.CallToolRequest]
+        request = types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(name="get_mesonet_stations", arguments={})
+        )
+        with patch('hcdp_mcp_server.server.HCDPClient') as mock_client_class, \
+                patch("mcp.server.lowlevel.server.jsonschema.validate", side_effect=AssertionError):
+            mock_client_class.return_value.get_mesonet_stations = AsyncMock(return_value=[])
+            response = await handler(request)
+
+        assert response.root.isError is False
+        assert json.loads(response.root.content[0].text) == []
+
+
+class TestCommandLine:
+    """Test the hcdp-mcp-server console entry point."""
+
+    def test_cli_prefers_uvloop_when_installed(self):
+        """Test that the CLI runs on uvloop if present and asyncio otherwise."""
+        with patch.object(server, "configure"), \
+                patch.object(server, "main", Mock(return_value="coro")), \
+                patch.object(server, "uvloop", Mock()) as mock_uvloop, \
+                patch.object(server.asyncio, "run") as mock_run:
+            server.cli_main()
+            mock_uvloop.run.assert_called_once_with("coro")
+            mock_run.assert_not_called()
+
+            server.uvloop = None
+            server.cli_main()
+            mock_run.assert_called_once_with("coro")
@@ -0,0 +1,51 @@
+"""Tests for the JSON serialization helpers."""
+
+import base64
+import json
+from datetime import date, datetime
+
+import numpy as np
+
+from hcdp_mcp_server import serialization
+
+
+class TestDumpsPretty:
+    """Test the indented encoder used for tool output."""
+
+    def test_numpy_values_serialize_as_plain_json(self):
+        """Test that NumPy arrays and scalars need no .tolist() first."""
+        text = serialization.dumps_pretty({
+            "values": np.array([1.5, 2.5]),
+            "mean": np.float64(2.0),
+            "count": np.int64(2),
+        })
+        assert json.loads(text) == {"values": [1.5, 2.5], "mean": 2.0, "count": 2}
+
+    def test_output_is_indented_and_unknown_types_stringified(self):
+        """Test the two-space layout and the str() fallback."""
+        text = serialization.dumps_pretty({"day": date(2024, 1, 15), "tags": {"a"}})
+        assert text.startswith('{\n  "day": "2024-01-15"')
+        assert json.loads(text)["tags"] == "{'a'}"
+
+    def test_datetimes_match_between_backends(self):
+        """Test that the stdlib fallback writes datetimes the way orjson does."""
+        stamp = datetime(2024, 1, 15, 10, 30)
+        assert serialization._default(stamp) == "2024-01-15T10:30:00"
+        assert json.loads(serialization.dumps_pretty({"at": stamp})) == {"at": "2024-01-15T10:30:00"}
+
+    def test_nested_bytes_serialize_as_base64(self):
+        """Test that bytes below the top level are base64 text, not a repr."""
+        payload = b"II*\x00\xff\x00"
+        text = serialization.dumps_pretty({"files": [{"name": "a.tif", "data": payload}]})
+        assert base64.b64decode(json.loads(text)["files"][0]["data"]) == payload
+
+
+class TestB64Encode:
+    """Test the base64 helper used for binary tool output."""
+
+    def test_round_trips_binary_payloads(self):
+        """Test that the helper returns standard base64 text."""
+        payload = bytes(range(256)) * 3
+        encoded = serialization.b64encode(payload)
+        assert isinstance(encoded, str)
+        assert base64.b64decode(encoded) == payload